@@ -0,0 +1,259 @@
+"""
+Audio sources for the speech recognizer.
+
+PortAudio calls CallbackCapture._on_audio from its own thread whenever a
+buffer of samples is ready; the samples are copied into a preallocated
+single-producer/single-consumer ring buffer that the recognizer thread reads
+from at its own pace. Nothing on the capture side blocks or allocates, so a
+slow decoder shows up as a growing fill level (and, at worst, overflow
+counters) instead of silently dropped audio.
+
+WavFileSource plays a recording through the same interface, at wall-clock
+speed or as fast as the decoder reads it, for offline runs and benchmarks.
+Every source has a `rate` and a `finished` flag and provides start(),
+stop(), read(frames, timeout) and stats().
+"""
+import threading
+import time
+import wave
+
+import numpy as np
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size SPSC ring of int16 samples.
+
+    The producer only advances `written` and the consumer only advances
+    `consumed`; both are monotonically increasing sample counts, so neither
+    side needs a lock. Samples that do not fit are dropped and counted in
+    `overflowed` rather than overwriting audio the consumer has not read.
+    """
+
+    def __init__(self, capacity):
+        """
+        Allocate the ring.
+
+        Args:
+            capacity (int): Number of samples the ring holds
+        """
+        self.capacity = capacity
+        self.samples = np.zeros(capacity, dtype=np.int16)
+        self.written = 0
+        self.consumed = 0
+        self.overflowed = 0
+        self.max_fill = 0
+        self._data_ready = threading.Event()
+
+    def __len__(self):
+        return self.written - self.consumed
+
+    def write(self, data):
+        """Append raw int16 bytes, dropping whatever does not fit"""
+        incoming = np.frombuffer(data, dtype=np.int16)
+        free = self.capacity - (self.written - self.consumed)
+        if len(incoming) > free:
+            self.overflowed += len(incoming) - free
+            incoming = incoming[:free]
+
+        count = len(incoming)
+        if count:
+            start = self.written % self.capacity
+            first = min(count, self.capacity - start)
+            self.samples[start:start + first] = incoming[:first]
+            self.samples[:count - first] = incoming[first:]
+            self.written += count
+            self.max_fill = max(self.max_fill, self.written - self.consumed)
+        self._data_ready.set()
+
+    def read(self, count, timeout=None):
+        """
+        Take exactly `count` samples as int16 bytes.
+
+        Returns:
+            bytes: The samples, or None if they did not arrive within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.written - self.consumed < count:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._data_ready.clear()
+            # Re-check after clearing so a write in between is not missed
+            if self.written - self.consumed >= count:
+                break
+            self._data_ready.wait(remaining)
+
+        start = self.consumed % self.capacity
+        first = min(count, self.capacity - start)
+        if first == count:
+            data = self.samples[start:start + count].tobytes()
+        else:
+            data = self.samples[start:].tobytes() + self.samples[:count - first].tobytes()
+        self.consumed += count
+        return data
+
+    def wake(self):
+        """Release a reader waiting in read(), e.g. when capture stops"""
+        self._data_ready.set()
+
+
+class CallbackCapture:
+    """
+    16-bit mono microphone input delivered through an AudioRingBuffer.
+    """
+
+    def __init__(self, rate=16000, frames_per_buffer=1024, buffer_seconds=4.0):
+        """
+        Configure capture; the device is not opened until start().
+
+        Args:
+            rate (int): Sample rate in Hz
+            frames_per_buffer (int): Samples PortAudio delivers per callback
+            buffer_seconds (float): Ring buffer length, the most audio the
+                decoder can fall behind by before samples are dropped
+        """
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.ring = AudioRingBuffer(int(rate * buffer_seconds))
+        self.input_overflows = 0  # Overflows PortAudio reported before the callback ran
+        self.callbacks = 0
+        self.finished = False  # A microphone never runs out
+        self._audio = None
+        self._stream = None
+
+    def start(self):
+        if pyaudio is None:
+            raise RuntimeError("PyAudio is required for microphone capture")
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._on_audio
+        )
+        self._stream.start_stream()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+        self.ring.wake()
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        if status & pyaudio.paInputOverflow:
+            self.input_overflows += 1
+        self.ring.write(in_data)
+        self.callbacks += 1
+        return None, pyaudio.paContinue
+
+    def read(self, frames, timeout=None):
+        """Return the next `frames` samples as bytes, or None on timeout"""
+        return self.ring.read(frames, timeout)
+
+    @property
+    def latency(self):
+        """Seconds of captured audio waiting to be decoded"""
+        return len(self.ring) / self.rate
+
+    def stats(self):
+        ring = self.ring
+        return {
+            "captured": ring.written,
+            "consumed": ring.consumed,
+            "overflowed": ring.overflowed,
+            "input_overflows": self.input_overflows,
+            "callbacks": self.callbacks,
+            "latency": self.latency,
+            "max_latency": ring.max_fill / self.rate,
+        }
+
+
+class WavFileSource:
+    """
+    16-bit PCM WAV file played as if it were being captured.
+    """
+
+    def __init__(self, path, realtime=False):
+        """
+        Load the file; multi-channel audio is mixed down to mono.
+
+        Args:
+            path (str): WAV file to play
+            realtime (bool): Deliver samples no faster than wall-clock time,
+                otherwise as fast as they are read
+        """
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            self.rate = wav.getframerate()
+            channels = wav.getnchannels()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+        self.path = path
+        self.samples = samples
+        self.realtime = realtime
+        self.position = 0
+        self.finished = False
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.rate
+
+    def start(self):
+        self.position = 0
+        self.finished = False
+        self.started_at = time.perf_counter()
+        self.stopped_at = None
+
+    def stop(self):
+        if self.stopped_at is None:
+            self.stopped_at = time.perf_counter()
+
+    def read(self, frames, timeout=None):
+        """Return the next `frames` samples as bytes (fewer at the end), or None once finished"""
+        if self.position >= len(self.samples):
+            self.finished = True
+            return None
+
+        end = min(self.position + frames, len(self.samples))
+        if self.realtime:
+            due = self.started_at + end / self.rate
+            wait = due - time.perf_counter()
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                return None
+            if wait > 0:
+                time.sleep(wait)
+
+        data = self.samples[self.position:end].tobytes()
+        self.position = end
+        return data
+
+    def stats(self):
+        """Audio length, processing time and real-time factor (processing time / audio length)"""
+        end = self.stopped_at if self.stopped_at is not None else time.perf_counter()
+        elapsed = end - self.started_at if self.started_at is not None else 0.0
+        audio_seconds = self.position / self.rate
+        return {
+            "path": self.path,
+            "audio_seconds": audio_seconds,
+            "elapsed": elapsed,
+            "rtf": elapsed / audio_seconds if audio_seconds else 0.0,
+            "realtime": self.realtime,
+        }
@@ -0,0 +1,258 @@
+"""
+Sign playback on the avatar's joints.
+
+AvatarSigner owns everything between a sentence and moving joints: the
+pose library, phrase matching, the blender (or the baked animation player),
+fingerspelling transitions, the sign scheduler and the interval pool. The
+apps only build the scene, show status text and decide what to sign.
+"""
+import os
+
+from direct.interval.IntervalGlobal import Sequence
+from direct.interval.LerpInterval import LerpPosInterval
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import LVecBase3f
+
+from bake_anim import BakedSignPlayer, baked_path
+from fingerspell import TransitionTable
+from interval_pool import IntervalPool
+from nearest_sign import load_nearest_signs
+from phrase_trie import PhraseTrie
+from pose_blend import PoseBlender
+from pose_library import load_pose_library
+from sign_scheduler import SignScheduler
+from spelling import load_word_list
+
+
+class AvatarSigner:
+    """
+    Plays sentences on a rigged avatar, one sign after another.
+    """
+
+    def __init__(self, joints, larm, rarm, torso, library_path="sign_poses.json", status=None, finished=None,
+                 use_baked_animation=False, hold_time=0.3, preempt_blend_time=0.25,
+                 nearest_path="nearest_signs.tsv", words_path=None):
+        """
+        Load the pose library and put the avatar in its default pose.
+
+        Args:
+            joints (list): Joint NodePaths in pose library order, see JOINT_NAMES
+            larm (NodePath): Left arm, slid for repeated letters
+            rarm (NodePath): Right arm, slid for repeated letters
+            torso (NodePath): Parent for baked animation
+            library_path (str): Pose library JSON
+            status (function): Called with a status line as signing progresses
+            finished (function): Called with no arguments when a sentence is done
+            use_baked_animation (bool): Play signs through Panda3D's C++ animation system
+            hold_time (float): Seconds each sign is held before the next starts
+            preempt_blend_time (float): Longest an interruption or reset takes to blend out
+            nearest_path (str): Nearest-sign table built with nearest_sign.py; if it exists,
+                unknown words are replaced by the closest sign instead of fingerspelled
+            words_path (str): Word list, one word per line; if it exists, misspelled
+                words are corrected to lexicon words. Leave it out for recognizer
+                output, which ContinuousSpeechGloss already corrects
+        """
+        self.larm = larm
+        self.rarm = rarm
+        self.status = status or (lambda text: None)
+        self.finished = finished
+        self.preempt_blend_time = preempt_blend_time
+
+        self.gesture_data = load_pose_library(library_path)
+        self.transitions = TransitionTable(self.gesture_data)
+        self.phrases = PhraseTrie(self.gesture_data, known_words=load_word_list(words_path),
+                                  nearest=load_nearest_signs(nearest_path))
+        self.blender = PoseBlender(joints)
+        self.baked_player = None
+        if use_baked_animation:
+            self.baked_player = BakedSignPlayer(joints, self.gesture_data, torso)
+            # Use the offline bake if it is current, otherwise clips are baked on first use
+            anims_path = baked_path(library_path)
+            if os.path.exists(anims_path) and os.path.getmtime(anims_path) >= os.path.getmtime(library_path):
+                self.baked_player.load_baked(anims_path)
+        self.intervals = IntervalPool("AvatarIntervals")
+        self.scheduler = SignScheduler(self._animate_next, self._finish, hold_time=hold_time)
+
+        self.current_text = ""
+        self.current_pose = "default"
+        self.expanded_sequence = []
+        self.pose_index = 0
+        self.is_animating = False
+        self._utterance_task = None
+
+        self.snap_to_pose(self.current_pose)
+
+    def expand(self, words):
+        # Longest lexicon phrase at each word, fingerspelling words no entry covers
+        return self.phrases.expand(words)
+
+    def sign(self, text, words):
+        """
+        Interrupt whatever is playing and sign a sentence.
+
+        Args:
+            text (str): Sentence shown in status lines
+            words (list): Words or gloss tokens to sign
+
+        Returns:
+            bool: False if nothing in words could be signed
+        """
+        # If there's already animation running, stop it
+        self.stop()
+
+        self.current_text = text
+        self.expanded_sequence = self.expand(words)
+        if not self.expanded_sequence:
+            return False
+
+        self.status(f"Signing: {self.current_text}")
+        self.pose_index = 0
+        self.is_animating = True
+
+        # Start signing; each sign begins when the previous one finishes
+        self.scheduler.start(self.expanded_sequence)
+        return True
+
+    def stop(self):
+        # Stop scheduling further signs
+        if self.is_animating:
+            self.scheduler.stop()
+            self.is_animating = False
+
+        # Cancel whatever is still moving the joints and keep the live pose,
+        # so the next clip blends out from here instead of snapping
+        self.intervals.pause_all()
+        self.blender.stop()
+
+    def snap_to_pose(self, name):
+        """Jump straight to the first frame of a pose"""
+        clip = self.gesture_data.clip(name)
+        if not clip:
+            return
+
+        if self.baked_player:
+            self.baked_player.stop()
+        self.blender.snap(clip.frames[0])
+
+    def blend_to_pose(self, name):
+        """Blend from the live pose into a pose within preempt_blend_time"""
+        if self.baked_player:
+            self.baked_player.play(name)
+            return
+
+        clip = self.gesture_data.clip(name)
+        if clip:
+            self.blender.play(clip, frame_time=self.preempt_blend_time)
+
+    def follow(self, utterances, start, task_name="UtteranceTask"):
+        """
+        Sign from an UtteranceQueue whenever the avatar is free.
+
+        Args:
+            utterances (UtteranceQueue): Queue to take utterances from
+            start (function): Called with (text, gloss) to sign the next utterance
+            task_name (str): Name of the per-frame task
+        """
+        def utterance_task(task):
+            if utterances.take_preempt():
+                self.stop()
+
+            if not self.is_animating:
+                utterance = utterances.get_nowait()
+                if utterance:
+                    start(utterance.text, utterance.gloss)
+            return Task.cont
+
+        self._utterance_task = task_name
+        taskMgr.add(utterance_task, task_name)
+
+    def destroy(self):
+        if self._utterance_task:
+            taskMgr.remove(self._utterance_task)
+        self.stop()
+        self.scheduler.stop()
+        self.intervals.destroy()
+        self.blender.destroy()
+        if self.baked_player:
+            self.baked_player.destroy()
+
+    def letter_run(self):
+        """Collect the run of fingerspelled letters starting at the current pose index"""
+        run = []
+        for name in self.expanded_sequence[self.pose_index:]:
+            if len(name) != 1 or name not in self.transitions:
+                break
+            run.append(name)
+        return run
+
+    def slide_arms(self):
+        slide_distance = 0.5
+        time = 0.2  # Increased wait time between poses
+
+        # Reuse an idle slide Sequence, retargeted to where the arms are now
+        sequence = self.intervals.acquire(("SlideArms", time), self._build_slide_arms, time)
+        larm_pos = self.larm.getPos()
+        rarm_pos = self.rarm.getPos()
+        hold_left, slide_out, return_left, slide_back = sequence.ivals
+        hold_left.setEndPos(larm_pos)
+        slide_out.setEndPos(rarm_pos + LVecBase3f(-slide_distance, 0, 0))
+        return_left.setEndPos(larm_pos)
+        slide_back.setEndPos(rarm_pos)
+        return self.intervals.start(sequence)
+
+    def _build_slide_arms(self, time):
+        return Sequence(
+            LerpPosInterval(self.larm, time, self.larm.getPos()),
+            LerpPosInterval(self.rarm, time, self.rarm.getPos()),
+            LerpPosInterval(self.larm, time, self.larm.getPos()),
+            LerpPosInterval(self.rarm, time, self.rarm.getPos())
+        )
+
+    def _finish(self):
+        self.blend_to_pose("default")
+        self.pose_index = 0
+        self.is_animating = False
+        self.current_pose = ""
+        self.status("Animation Complete")
+        if self.finished:
+            self.finished()
+
+    def _animate_next(self, sequence, index):
+        """Start the sign (or run of letters) at index; returns (poses used, completion event)"""
+        self.pose_index = index
+
+        # Stream a run of fingerspelled letters through the precomputed transitions
+        run = self.letter_run()
+        if len(run) > 1 and not self.baked_player:
+            poses, durations = self.transitions.stream(run)
+            self.blender.play_keys(poses, durations)
+            self.current_pose = run[-1]
+            self.status(f"Signing: {self.current_text} ('{''.join(run)}')")
+            return len(run), self.blender.done_event
+
+        pose_name = sequence[index]
+
+        # Check for same as previous
+        if self.current_pose == pose_name and len(pose_name) == 1:
+            return 1, self.slide_arms()
+
+        self.current_pose = pose_name
+        clip = self.gesture_data.clip(pose_name)
+
+        if not clip:
+            return 1, None
+
+        # Blend the whole body through the clip's keyframes
+        if self.baked_player:
+            self.baked_player.play(pose_name)
+            done_event = self.baked_player.done_event
+        else:
+            self.blender.play(clip)
+            done_event = self.blender.done_event
+
+        # Update display to show current pose
+        self.status(f"Signing: {self.current_text} ('{pose_name}')")
+
+        # The scheduler starts the next sign when this one reports completion
+        return 1, done_event
@@ -0,0 +1,276 @@
+"""
+Bake pose-library entries into native Panda3D animation.
+
+Each entry becomes an AnimBundle with one AnimChannelMatrixXfmTable per joint,
+bound to a Character whose joints drive the arm and finger NodePaths. Playback
+and keyframe interpolation then run in Panda3D's C++ animation system; Python
+only chooses which clip plays.
+
+Usage:
+    python bake_anim.py sign_poses.json [-o sign_poses.anims.bam] [--frame-time 0.2]
+"""
+import argparse
+import os
+
+import numpy as np
+from direct.showbase.MessengerGlobal import messenger
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import (
+    AnimBundle, AnimBundleNode, AnimChannelMatrixXfmTable, AnimGroup, Character, CharacterJoint,
+    ClockObject, CPTA_stdfloat, Loader, NodePath, OmniBoundingVolume, PartGroup, PTA_stdfloat,
+    TransformState,
+)
+
+from pose_library import JOINT_NAMES, load_pose_library
+from timeline_cache import TimelineCache
+
+BAKED_SUFFIX = ".anims.bam"
+SKELETON = "<skeleton>"
+TABLE_IDS = (b"x", b"y", b"z", b"h", b"p", b"r")
+# Every anim bundle is named after its sign, so the root name never matches the character
+BIND_FLAGS = PartGroup.HMF_ok_part_extra | PartGroup.HMF_ok_anim_extra | PartGroup.HMF_ok_wrong_root_name
+
+
+def baked_path(json_path):
+    """Return the path of the baked animation file for a pose JSON file"""
+    return os.path.splitext(json_path)[0] + BAKED_SUFFIX
+
+
+def rest_pose(library, name="default"):
+    """Return the first frame of the rest entry with unset joints zeroed"""
+    clip = library.clip(name)
+    if clip is None:
+        return np.zeros((len(JOINT_NAMES), len(TABLE_IDS)), dtype=np.float32)
+    return np.nan_to_num(clip.values[0])
+
+
+def bake_clip(clip, rest, frame_time=0.2):
+    """
+    Bake a SignClip into an AnimBundle with one keyframe per clip frame.
+
+    Joints a frame leaves out hold their previous value, starting from the
+    rest pose. Channels that never move are stored as a single value.
+
+    Args:
+        clip (SignClip): Clip to bake
+        rest (ndarray): (JOINT_COUNT, 6) rest pose
+        frame_time (float): Seconds between keyframes
+
+    Returns:
+        AnimBundle: The baked animation
+    """
+    keys = np.empty_like(clip.values)
+    previous = rest
+    for k, frame in enumerate(clip.frames):
+        keys[k] = np.where(frame.mask[:, None], frame.values, previous)
+        previous = keys[k]
+
+    anim = AnimBundle(clip.name, 1.0 / frame_time, len(keys))
+    skeleton = AnimGroup(anim, SKELETON)
+    for j, joint_name in enumerate(JOINT_NAMES):
+        channel = AnimChannelMatrixXfmTable(skeleton, joint_name)
+        for column, table_id in enumerate(TABLE_IDS):
+            values = keys[:, j, column]
+            if (values == values[0]).all():
+                values = values[:1]
+            channel.setTable(table_id, CPTA_stdfloat(PTA_stdfloat(np.ascontiguousarray(values, dtype=np.float32))))
+    return anim
+
+
+def anim_nbytes(anim):
+    """Bytes held by the channel tables of an AnimBundle made by bake_clip"""
+    skeleton = anim.getChild(0)
+    count = 0
+    for j in range(skeleton.getNumChildren()):
+        channel = skeleton.getChild(j)
+        for table_id in TABLE_IDS:
+            count += len(channel.getTable(table_id))
+    return count * np.dtype(np.float32).itemsize
+
+
+def bake_library(json_path, out_path=None, frame_time=0.2):
+    """
+    Bake every entry of a pose JSON file into a .bam of AnimBundleNodes.
+
+    Args:
+        json_path (str): Path to the pose JSON file
+        out_path (str): Output path, defaults to the JSON path with a .anims.bam suffix
+        frame_time (float): Seconds between keyframes
+
+    Returns:
+        str: Path of the written file
+    """
+    out_path = out_path or baked_path(json_path)
+    library = load_pose_library(json_path)
+    rest = rest_pose(library)
+
+    root = NodePath("sign_anims")
+    for name in library:
+        root.attachNewNode(AnimBundleNode(name, bake_clip(library.clip(name), rest, frame_time)))
+    root.writeBamFile(out_path)
+    return out_path
+
+
+class BakedSignPlayer:
+    """
+    Plays baked sign clips on a Character that drives the avatar's joints.
+
+    Clips are baked on first use unless they were loaded from a baked file;
+    clips baked here live in an LRU TimelineCache keyed by (name, library
+    version) so the baked tables stay within a size budget. Starting a clip
+    cross-fades from whatever the previous clip left the joints in, using
+    PartBundle control effects. done_event is sent when a clip reaches its
+    last frame.
+    """
+
+    def __init__(self, joints, library, parent, frame_time=0.2, blend_time=0.1, cache=None):
+        """
+        Build the character rig.
+
+        Args:
+            joints (list): NodePaths in pose library joint order
+            library (PoseLibrary): Pose library to bake clips from
+            parent (NodePath): Node the character is attached under
+            frame_time (float): Seconds between keyframes for clips baked here
+            blend_time (float): Cross-fade time between clips
+            cache (TimelineCache): Cache for clips baked on demand, a private one by default
+        """
+        self.library = library
+        self.frame_time = frame_time
+        self.blend_time = blend_time
+        self.clock = ClockObject.getGlobalClock()
+        self.rest = rest_pose(library)
+
+        character = Character("signer")
+        self.bundle = character.getBundle(0)
+        skeleton = PartGroup(self.bundle, SKELETON)
+        for joint_name, joint, rest in zip(JOINT_NAMES, joints, self.rest):
+            default = TransformState.makePosHpr(tuple(rest[0:3]), tuple(rest[3:6])).getMat()
+            CharacterJoint(character, self.bundle, skeleton, joint_name, default).addLocalTransform(joint.node())
+
+        self.bundle.setAnimBlendFlag(True)
+        self.bundle.setFrameBlendFlag(True)
+
+        # The character has no geometry, so keep it from being culled or it would never update
+        self.node_path = parent.attachNewNode(character)
+        character.setBounds(OmniBoundingVolume())
+        character.setFinal(True)
+
+        self.done_event = "BakedSignPlayer-done"
+        self.controls = {}  # Preloaded from a baked file
+        self.cache = cache if cache is not None else TimelineCache()
+        self.current = None
+        self._active = []  # Controls with a non-zero effect
+        self._fading = []
+        self._fade_start = 0.0
+
+    def load_baked(self, path):
+        """Bind every AnimBundle in a file written by bake_library"""
+        root = NodePath(Loader.getGlobalPtr().loadSync(path))
+        for node_path in root.findAllMatches("**/+AnimBundleNode"):
+            anim = node_path.node().getBundle()
+            self.controls[anim.getName()] = self.bundle.bindAnim(anim, BIND_FLAGS)
+
+    def control(self, name):
+        """Return the AnimControl for a pose name, baking it if needed"""
+        control = self.controls.get(name)
+        if control is None:
+            clip = self.library.clip(name)
+            if clip is None:
+                return None
+            control = self.cache.get((name, clip.version), self._bind_clip, clip)
+        return control
+
+    def _bind_clip(self, clip):
+        anim = bake_clip(clip, self.rest, self.frame_time)
+        return self.bundle.bindAnim(anim, BIND_FLAGS), anim_nbytes(anim)
+
+    def play(self, name):
+        """
+        Start a clip, cross-fading out of the previous one.
+
+        Returns:
+            float: Clip duration in seconds, or None if the pose is unknown
+        """
+        control = self.control(name)
+        if control is None:
+            return None
+
+        previous = self.current
+        self.current = control
+        control.play()
+
+        self._fading = [c for c in self._active if c is not control]
+        self._active = self._fading + [control]
+        if not self._fading or self.blend_time <= 0:
+            self._set_effects(1.0)
+            self._active = [control]
+        else:
+            self._set_effects(0.0)
+            self._fade_start = self.clock.getFrameTime()
+            taskMgr.remove("BakedSignFade")
+            taskMgr.add(self._fade, "BakedSignFade")
+
+        if previous is not None and previous is not control:
+            previous.stop()
+
+        duration = (control.getNumFrames() - 1) / control.getFrameRate()
+        taskMgr.remove("BakedSignDone")
+        taskMgr.doMethodLater(duration, self._send_done, "BakedSignDone")
+        return duration
+
+    def _send_done(self, task):
+        messenger.send(self.done_event)
+        return Task.done
+
+    def _set_effects(self, weight):
+        for control in self._fading:
+            self.bundle.setControlEffect(control, 1.0 - weight)
+        self.bundle.setControlEffect(self.current, weight)
+
+    def _fade(self, task):
+        weight = min((self.clock.getFrameTime() - self._fade_start) / self.blend_time, 1.0)
+        self._set_effects(weight)
+        if weight >= 1.0:
+            self._fading = []
+            self._active = [self.current]
+            return Task.done
+        return Task.cont
+
+    def is_playing(self):
+        return self.current is not None and self.current.isPlaying()
+
+    def stop(self):
+        """Stop playback, leaving the joints where the clip left them"""
+        taskMgr.remove("BakedSignDone")
+        taskMgr.remove("BakedSignFade")
+        if self._fading:
+            self._set_effects(1.0)
+            self._fading = []
+            self._active = [self.current]
+        if self.current is not None:
+            self.current.stop()
+
+    def destroy(self):
+        self.stop()
+        self.node_path.removeNode()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake pose library entries into Panda3D animations")
+    parser.add_argument("json_files", nargs="+", help="Pose JSON files to bake")
+    parser.add_argument("-o", "--output", help="Output path (only with a single input file)")
+    parser.add_argument("--frame-time", type=float, default=0.2, help="Seconds between keyframes")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.json_files) > 1:
+        parser.error("--output can only be used with a single input file")
+
+    for json_path in args.json_files:
+        out_path = bake_library(json_path, args.output, args.frame_time)
+        print(f"Baked {json_path} into {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import TextNode, Vec4, Point3, NodePath, LVecBase3f, DirectionalLight, AmbientLight
+from panda3d.core import TextNode, Vec4, Point3, NodePath, DirectionalLight, AmbientLight
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui.OnscreenImage import OnscreenImage
 from direct.gui.DirectButton import DirectButton
@@ -8,9 +8,9 @@ from direct.gui.DirectEntry import DirectEntry
 from direct.gui.DirectLabel import DirectLabel
 from direct.gui import DirectGuiGlobals as DGG
 from direct.task import Task
-from direct.interval.LerpInterval import LerpPosInterval, LerpHprInterval
-from direct.interval.IntervalGlobal import Sequence
-import json
+from pose_library import JOINT_NAMES
+from avatar_signer import AvatarSigner
+from utterance_queue import UtteranceQueue
 import random
 import sys
 import time
@@ -38,13 +38,19 @@ class SignLanguageApp(ShowBase):
         self.setupSkybox()
 
         # Load pose data
+        self.use_baked_animation = False  # Play signs through Panda3D's C++ animation system
+        self.sign_hold_time = 0.3  # Seconds each sign is held before the next starts
+        self.signer = None
         try:
-            self.current_pose = "default"
-            self.gesture_data = self.loadAllPoseData()
-            self.loadSignPoses(self.current_pose)
-            self.expanded_sequence = []
-            self.pose_index = 0
-            self.is_animating = False
+            # Optional: build nearest_signs.tsv with nearest_sign.py to replace fingerspelling
+            # of unknown words with the closest sign, and add a words.txt word list (one word
+            # per line, or a Vosk model's graph/words.txt) to correct misspelled typed words
+            self.signer = AvatarSigner(
+                self.joints, self.larm, self.rarm, self.torso, "sign_poses.json",
+                status=lambda text: self.text_display.setText(text), finished=self.finishAnimation,
+                use_baked_animation=self.use_baked_animation, hold_time=self.sign_hold_time,
+                nearest_path="nearest_signs.tsv", words_path="words.txt"
+            )
         except Exception as e:
             print(f"Could not load pose data: {e}")
 
@@ -56,6 +62,13 @@ class SignLanguageApp(ShowBase):
         self.media_state = "paused"
         self.tabs_visible = False
 
+        # Typed text waits here until the avatar is free to sign it
+        self.utterance_policy = "queue"  # queue, coalesce, drop_oldest or preempt
+        # Never block here: the UI runs on the same thread that drains the queue
+        self.utterances = UtteranceQueue(maxsize=8, policy=self.utterance_policy, put_timeout=0)
+        if self.signer:
+            self.signer.follow(self.utterances, self.start_animation)
+
         # Create UI elements
         self.setup_ui()
 
@@ -129,6 +142,9 @@ class SignLanguageApp(ShowBase):
         self.lpinky2 = self.larm.find("**/p2")
         self.lpinky3 = self.larm.find("**/p3")
 
+        # Joint NodePaths in pose library order (arm roots, then fingers)
+        self.joints = [getattr(self, name) for name in JOINT_NAMES]
+
     def setupLights(self):
         mainLight = DirectionalLight('main light')
         mainLight.setShadowCaster(True)
@@ -153,69 +169,6 @@ class SignLanguageApp(ShowBase):
         except Exception as e:
             print(f"Could not load skybox: {e}")
 
-    def loadAllPoseData(self):
-        with open("sign_poses.json", "r") as f:
-            return json.load(f)
-
-    def loadSignPoses(self, name):
-        poses = self.gesture_data.get(name)
-        if isinstance(poses, list):
-            pose = poses[0]
-        else:
-            pose = poses
-
-        if not pose:
-            return
-
-        l = pose["leftHand"]
-        r = pose["rightHand"]
-        self.larm.setPos(*l["pos"])
-        self.larm.setHpr(*l["hpr"])
-        self.rarm.setPos(*r["pos"])
-        self.rarm.setHpr(*r["hpr"])
-
-        def applyFingerPose(finger_parts, data):
-            for part, pose_data in zip(finger_parts, data):
-                part.setPos(*pose_data["pos"])
-                part.setHpr(*pose_data["hpr"])
-
-        if "fingers" in l:
-            f = l["fingers"]
-            if "thumb" in f:
-                applyFingerPose([self.lthumb1, self.lthumb2], f["thumb"])
-            if "index" in f:
-                applyFingerPose([self.lindex1, self.lindex2, self.lindex3], f["index"])
-            if "middle" in f:
-                applyFingerPose([self.lmiddle1, self.lmiddle2, self.lmiddle3], f["middle"])
-            if "ring" in f:
-                applyFingerPose([self.lring1, self.lring2, self.lring3], f["ring"])
-            if "pinky" in f:
-                applyFingerPose([self.lpinky1, self.lpinky2, self.lpinky3], f["pinky"])
-
-        if "fingers" in r:
-            f = r["fingers"]
-            if "thumb" in f:
-                applyFingerPose([self.rthumb1, self.rthumb2], f["thumb"])
-            if "index" in f:
-                applyFingerPose([self.rindex1, self.rindex2, self.rindex3], f["index"])
-            if "middle" in f:
-                applyFingerPose([self.rmiddle1, self.rmiddle2, self.rmiddle3], f["middle"])
-            if "ring" in f:
-                applyFingerPose([self.rring1, self.rring2, self.rring3], f["ring"])
-            if "pinky" in f:
-                applyFingerPose([self.rpinky1, self.rpinky2, self.rpinky3], f["pinky"])
-
-    def expandPoseSequence(self, sequence):
-        result = []
-        for word in sequence:
-            if word.lower() in self.gesture_data:
-                result.append(word.lower())
-            else:
-                for letter in word.lower():
-                    if letter in self.gesture_data:
-                        result.append(letter)
-        return result
-
     def setup_buttons(self):
         # Button to change model color
         self.color_button = DirectButton(
@@ -254,9 +207,9 @@ class SignLanguageApp(ShowBase):
         self.torso.setColorScale(r, g, b, 1)
 
     def reset_pose(self):
-        # Reset to default pose
-        self.loadSignPoses("default")
-        self.stopAnimation()
+        # Interrupt any signing and blend back to the default pose
+        self.signer.stop()
+        self.signer.blend_to_pose("default")
 
     def setup_textbox(self):
         # Create a text entry box
@@ -292,7 +245,7 @@ class SignLanguageApp(ShowBase):
             scale=0.1,
             frameSize=(-2, 2, -0.5, 0.5),
             pos=(0.75, 0, -0.8),
-            command=self.start_animation
+            command=self.queue_text
         )
 
     def process_text(self, text):
@@ -302,130 +255,23 @@ class SignLanguageApp(ShowBase):
         # Store the text but don't animate yet
         self.current_text = text.strip()
 
-    def start_animation(self):
-        # If there's already animation running, stop it
-        self.stopAnimation()
-
-        # Get text from entry if process_text hasn't been called
-        self.current_text = self.text_entry.get().strip()
+    def queue_text(self):
+        # Queue the typed text; the signer takes it once the avatar is free
+        text = self.text_entry.get().strip()
+        if text and not self.utterances.put(text):
+            self.text_display.setText("Too many sentences waiting, try again shortly")
 
-        # Split the text into words
-        words = self.current_text.split()
+    def start_animation(self, text, gloss=None):
+        self.current_text = text
 
-        # Create an expanded sequence of poses
-        self.expanded_sequence = self.expandPoseSequence(words)
-
-        if not self.expanded_sequence:
+        # Split the text into words; interrupts anything already signing
+        words = gloss.split() if gloss else self.current_text.split()
+        if not self.signer.sign(self.current_text, words):
             self.text_display.setText("No valid signs found in text")
-            return
-
-        self.text_display.setText(f"Signing: {self.current_text}")
-        self.pose_index = 0
-        self.is_animating = True
-
-        # Start animation task
-        taskMgr.add(self.animateNextPose, "SignAnimation")
-
-    def stopAnimation(self):
-        # Stop any running animation task
-        if self.is_animating:
-            taskMgr.remove("SignAnimation")
-            self.is_animating = False
-
-    def slideArms(self):
-        slide_distance = 0.5
-        time = 0.2  # Increased wait time between poses
-
-        sequence = Sequence(
-            LerpPosInterval(self.larm, time, self.larm.getPos()),
-            LerpPosInterval(self.rarm, time, self.rarm.getPos() + LVecBase3f(-slide_distance, 0, 0)),
-            LerpPosInterval(self.larm, time, self.larm.getPos()),
-            LerpPosInterval(self.rarm, time, self.rarm.getPos())
-        )
-        sequence.start()
-
-    def animateNextPose(self, task):
-        if self.pose_index >= len(self.expanded_sequence):
-            self.loadSignPoses("default")
-            self.pose_index = 0
-            self.is_animating = False
-            self.text_display.setText("Animation Complete")
-            self.current_pose = ""
-
-            # Reset the text display after a short delay
-            taskMgr.doMethodLater(2, self.reset_text_display, "ResetTextDisplay")
-
-            return Task.done
-
-        pose_name = self.expanded_sequence[self.pose_index]
-
-        # Check for same as previous
-        if self.current_pose == pose_name and len(pose_name) == 1:
-            self.slideArms()
-            self.pose_index += 1
-            return task.again
-
-        self.current_pose = pose_name
-        poses = self.gesture_data.get(pose_name)
-
-        if not poses:
-            self.pose_index += 1
-            return task.again
-
-        sequence = []
-        time = 0.05  # Slower movement between poses
-
-        def addFingerLerp(hand_data, finger_map):
-            if "fingers" not in hand_data:
-                return
-            for name, parts in finger_map.items():
-                if name in hand_data["fingers"]:
-                    for part, pose_data in zip(parts, hand_data["fingers"][name]):
-                        sequence.append(LerpPosInterval(part, 0, LVecBase3f(*pose_data["pos"])))
-                        sequence.append(LerpHprInterval(part, 0, LVecBase3f(*pose_data["hpr"])))
-
-        def addHandAndFingers(pose):
-            l = pose["leftHand"]
-            r = pose["rightHand"]
-            sequence.extend([
-                LerpPosInterval(self.larm, time, LVecBase3f(*l["pos"])),
-                LerpHprInterval(self.larm, time, LVecBase3f(*l["hpr"])),
-                LerpPosInterval(self.rarm, time, LVecBase3f(*r["pos"])),
-                LerpHprInterval(self.rarm, time, LVecBase3f(*r["hpr"]))
-            ])
-            addFingerLerp(l, {
-                "thumb": [self.lthumb1, self.lthumb2],
-                "index": [self.lindex1, self.lindex2, self.lindex3],
-                "middle": [self.lmiddle1, self.lmiddle2, self.lmiddle3],
-                "ring": [self.lring1, self.lring2, self.lring3],
-                "pinky": [self.lpinky1, self.lpinky2, self.lpinky3]
-            })
-            addFingerLerp(r, {
-                "thumb": [self.rthumb1, self.rthumb2],
-                "index": [self.rindex1, self.rindex2, self.rindex3],
-                "middle": [self.rmiddle1, self.rmiddle2, self.rmiddle3],
-                "ring": [self.rring1, self.rring2, self.rring3],
-                "pinky": [self.rpinky1, self.rpinky2, self.rpinky3]
-            })
-
-        if isinstance(poses, list):
-            for pose in poses:
-                addHandAndFingers(pose)
-        else:
-            addHandAndFingers(poses)
-
-        # Execute the sequence
-        Sequence(*sequence).start()
-
-        # Update display to show current pose
-        self.text_display.setText(f"Signing: {self.current_text} ('{pose_name}')")
-
-        # Move to next pose after a delay
-        task.delayTime = 1.5  # Long pause between signs
-        self.pose_index += 1
 
-        # Schedule next pose animation
-        return task.again
+    def finishAnimation(self):
+        # Reset the text display after a short delay
+        taskMgr.doMethodLater(2, self.reset_text_display, "ResetTextDisplay")
 
     def reset_text_display(self, task=None):
         # Reset text display and prepare for new input
@@ -3,7 +3,7 @@ from panda3d.core import loadPrcFile, DirectionalLight, AmbientLight, LVecBase3f
 from direct.interval.LerpInterval import LerpPosInterval, LerpHprInterval
 from direct.interval.IntervalGlobal import Sequence
 from direct.task import Task
-import json
+from pose_library import load_pose_library
 
 loadPrcFile("settings.prc")
 
@@ -91,8 +91,7 @@ class MyDemo(ShowBase):
         render.setShaderAuto()
 
     def loadAllPoseData(self):
-        with open("sign_poses.json", "r") as f:
-            return json.load(f)
+        return load_pose_library("sign_poses.json")
 
     def loadSignPoses(self, name):
         poses = self.gesture_data.get(name)
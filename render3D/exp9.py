@@ -1,5 +1,5 @@
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import TextNode, Vec4, Point3, NodePath, LVecBase3f, DirectionalLight, AmbientLight
+from panda3d.core import TextNode, Vec4, Point3, NodePath, DirectionalLight, AmbientLight
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui.OnscreenImage import OnscreenImage
 from direct.gui.DirectButton import DirectButton
@@ -8,163 +8,16 @@ from direct.gui.DirectEntry import DirectEntry
 from direct.gui.DirectLabel import DirectLabel
 from direct.gui import DirectGuiGlobals as DGG
 from direct.task import Task
-from direct.interval.LerpInterval import LerpPosInterval, LerpHprInterval
-from direct.interval.IntervalGlobal import Sequence
-import json
-import threading
 import time
-import pyaudio
-from vosk import Model, KaldiRecognizer
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-import string
-import queue
 import random
 import sys
 
-
-class ContinuousSpeechGloss:
-    """
-    Class for continuous speech recognition and gloss translation.
-    Runs in the background and processes speech without auto-stopping.
-    """
-
-    def __init__(self, model_path="C:\\Users\\DELL\\PycharmProjects\\ASR\\vosk-model-small-en-us-0.15", callback=None):
-        """
-        Initialize continuous speech recognition.
-
-        Args:
-            model_path (str): Path to the Vosk model
-            callback (function): Optional callback function that receives (transcript, gloss) tuples
-        """
-        # Ensure NLTK resources are downloaded
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-
-        # Setup NLP resources
-        self.stop_words = set(stopwords.words('english')) - {
-            'i', 'you', 'we', 'he', 'she', 'they', 'me', 'my', 'your', 'our', 'his', 'her', 'their'
-        }
-
-        # Gloss mapping for sign language
-        self.gloss_map = {
-            "i": "ME", "you": "YOU", "we": "US", "he": "HE", "she": "SHE", "they": "THEY",
-            "am": "", "is": "", "are": "", "was": "", "were": "",
-            "going": "GO", "go": "GO", "want": "WANT", "have": "HAVE", "had": "HAVE",
-            "don't": "NOT", "not": "NOT", "no": "NOT", "won't": "NOT WILL",
-            "store": "STORE", "because": "WHY", "milk": "MILK", "to": "",
-            "the": "", "a": "", "an": "", "and": "PLUS", "but": "BUT",
-            "this": "THIS", "that": "THAT", "there": "THERE", "here": "HERE",
-            "what": "WHAT", "who": "WHO", "where": "WHERE", "when": "WHEN", "why": "WHY", "how": "HOW",
-            "need": "NEED", "can": "CAN", "will": "WILL", "should": "SHOULD", "must": "MUST",
-            "good": "GOOD", "bad": "BAD", "happy": "HAPPY", "sad": "SAD",
-            "yes": "YES", "okay": "OK", "like": "LIKE", "help": "HELP"
-        }
-
-        self.model_path = model_path
-        self.callback = callback
-        self.running = False
-        self.thread = None
-        self.results = queue.Queue()  # Store results if no callback is provided
-
-    def convert_to_sign_gloss(self, text):
-        """Convert normal text to sign language gloss notation"""
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word not in string.punctuation]
-        filtered = [word for word in words if word not in self.stop_words or word.lower() in self.gloss_map]
-
-        gloss_sequence = []
-        for word in filtered:
-            gloss_word = self.gloss_map.get(word.lower(), word.upper())
-            if gloss_word:  # Only add non-empty strings
-                gloss_sequence.append(gloss_word)
-
-        gloss_string = " ".join(gloss_sequence)
-        return gloss_string
-
-    def start(self):
-        """Start continuous speech recognition"""
-        if self.running:
-            return False
-
-        self.running = True
-        self.thread = threading.Thread(target=self._listen_continuously)
-        self.thread.daemon = True
-        self.thread.start()
-        return True
-
-    def stop(self):
-        """Stop continuous speech recognition"""
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
-        return True
-
-    def get_latest_result(self):
-        """Get the latest result from the queue (if no callback was provided)"""
-        if not self.results.empty():
-            return self.results.get()
-        return None
-
-    def _listen_continuously(self):
-        """Background thread that listens for speech continuously"""
-        try:
-            # Setup Vosk model
-            model = Model(self.model_path)
-            recognizer = KaldiRecognizer(model, 16000)
-
-            # Setup audio stream
-            mic = pyaudio.PyAudio()
-            stream = mic.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=16000,
-                input=True,
-                frames_per_buffer=8192
-            )
-            stream.start_stream()
-
-            print("Continuous speech recognition started...")
-
-            while self.running:
-                data = stream.read(4096, exception_on_overflow=False)
-
-                if recognizer.AcceptWaveform(data):
-                    # Process final results
-                    result = json.loads(recognizer.Result())
-                    text = result.get("text", "").strip()
-
-                    if text:
-                        # Convert to gloss
-                        gloss = self.convert_to_sign_gloss(text)
-
-                        # Process result
-                        if self.callback:
-                            self.callback(text, gloss)
-                        else:
-                            self.results.put((text, gloss))
-
-                time.sleep(0.01)  # Small sleep to prevent CPU hogging
-
-            # Clean up resources
-            stream.stop_stream()
-            stream.close()
-            mic.terminate()
-            print("Continuous speech recognition stopped.")
-
-        except Exception as e:
-            error_msg = f"Error in speech recognition: {str(e)}"
-            print(error_msg)
-            if self.callback:
-                self.callback(error_msg, "")
-            else:
-                self.results.put((error_msg, ""))
-            self.running = False
+from pose_library import JOINT_NAMES
+from avatar_signer import AvatarSigner
+from utterance_queue import UtteranceQueue
+from speech_gloss import ContinuousSpeechGloss
+from speech_worker import SpeechWorker
+from handoff import FrameHandoff, join_results
 
 
 class SignLanguageApp(ShowBase):
@@ -189,13 +42,18 @@ class SignLanguageApp(ShowBase):
         self.setupSkybox()
 
         # Load pose data
+        self.use_baked_animation = False  # Play signs through Panda3D's C++ animation system
+        self.sign_hold_time = 0.3  # Seconds each sign is held before the next starts
+        self.signer = None
         try:
-            self.current_pose = "default"
-            self.gesture_data = self.loadAllPoseData()
-            self.loadSignPoses(self.current_pose)
-            self.expanded_sequence = []
-            self.pose_index = 0
-            self.is_animating = False
+            # Optional: build nearest_signs.tsv with nearest_sign.py to replace fingerspelling
+            # of unknown words with the closest sign
+            self.signer = AvatarSigner(
+                self.joints, self.larm, self.rarm, self.torso, "sign_poses.json",
+                status=lambda text: self.status_text.setText(text), finished=self.finishAnimation,
+                use_baked_animation=self.use_baked_animation, hold_time=self.sign_hold_time,
+                nearest_path="nearest_signs.tsv"
+            )
         except Exception as e:
             print(f"Could not load pose data: {e}")
 
@@ -209,10 +67,25 @@ class SignLanguageApp(ShowBase):
         # Speech recognition state
         self.speech_recognition_active = False
         self.speech_processor = None
+        self.use_speech_grammar = False  # Only recognize words in the sign lexicon
+        self.speech_out_of_process = False  # Capture and decode in a worker process
+        self.stream_speech = False  # Sign words as they settle instead of after each sentence
+        self.stream_finish_delay = 0.8  # Seconds streamed speech may pause before signing counts as done
 
         # Animation and media sync flags
         self.signing_complete = True  # Initially true since no signing is happening
 
+        # Recognized speech waits here until the avatar is free to sign it. Puts come from
+        # the main thread and must not block, so a full queue folds new speech into the
+        # newest waiting utterance instead of dropping it
+        self.utterance_policy = "coalesce"  # queue, coalesce, drop_oldest or preempt
+        self.utterances = UtteranceQueue(maxsize=8, policy=self.utterance_policy, put_timeout=0)
+        if self.signer:
+            self.signer.follow(self.utterances, self.start_animation)
+
+        # Recognizer results reach the GUI and animator only through this per-frame handoff
+        self.speech_results = FrameHandoff(self.handle_speech_result, merge=join_results, task_name="SpeechResults")
+
         # Create UI elements
         self.setup_ui()
 
@@ -333,6 +206,9 @@ class SignLanguageApp(ShowBase):
         self.lpinky2 = self.larm.find("**/p2")
         self.lpinky3 = self.larm.find("**/p3")
 
+        # Joint NodePaths in pose library order (arm roots, then fingers)
+        self.joints = [getattr(self, name) for name in JOINT_NAMES]
+
     def setupLights(self):
         mainLight = DirectionalLight('main light')
         mainLight.setShadowCaster(True)
@@ -357,201 +233,50 @@ class SignLanguageApp(ShowBase):
         except Exception as e:
             print(f"Could not load skybox: {e}")
 
-    def loadAllPoseData(self):
-        with open("sign_poses.json", "r") as f:
-            return json.load(f)
-
-    def loadSignPoses(self, name):
-        poses = self.gesture_data.get(name)
-        if isinstance(poses, list):
-            pose = poses[0]
-        else:
-            pose = poses
-
-        if not pose:
-            return
-
-        l = pose["leftHand"]
-        r = pose["rightHand"]
-        self.larm.setPos(*l["pos"])
-        self.larm.setHpr(*l["hpr"])
-        self.rarm.setPos(*r["pos"])
-        self.rarm.setHpr(*r["hpr"])
-
-        def applyFingerPose(finger_parts, data):
-            for part, pose_data in zip(finger_parts, data):
-                part.setPos(*pose_data["pos"])
-                part.setHpr(*pose_data["hpr"])
-
-        if "fingers" in l:
-            f = l["fingers"]
-            if "thumb" in f:
-                applyFingerPose([self.lthumb1, self.lthumb2], f["thumb"])
-            if "index" in f:
-                applyFingerPose([self.lindex1, self.lindex2, self.lindex3], f["index"])
-            if "middle" in f:
-                applyFingerPose([self.lmiddle1, self.lmiddle2, self.lmiddle3], f["middle"])
-            if "ring" in f:
-                applyFingerPose([self.lring1, self.lring2, self.lring3], f["ring"])
-            if "pinky" in f:
-                applyFingerPose([self.lpinky1, self.lpinky2, self.lpinky3], f["pinky"])
-
-        if "fingers" in r:
-            f = r["fingers"]
-            if "thumb" in f:
-                applyFingerPose([self.rthumb1, self.rthumb2], f["thumb"])
-            if "index" in f:
-                applyFingerPose([self.rindex1, self.rindex2, self.rindex3], f["index"])
-            if "middle" in f:
-                applyFingerPose([self.rmiddle1, self.rmiddle2, self.rmiddle3], f["middle"])
-            if "ring" in f:
-                applyFingerPose([self.rring1, self.rring2, self.rring3], f["ring"])
-            if "pinky" in f:
-                applyFingerPose([self.rpinky1, self.rpinky2, self.rpinky3], f["pinky"])
-
-    def expandPoseSequence(self, sequence):
-        result = []
-        for word in sequence:
-            if word.lower() in self.gesture_data:
-                result.append(word.lower())
-            else:
-                for letter in word.lower():
-                    if letter in self.gesture_data:
-                        result.append(letter)
-        return result
+    def start_animation(self, text, gloss=None):
+        """
+        Sign a sentence.
 
-    def start_animation(self, text):
-        # If there's already animation running, stop it
-        self.stopAnimation()
+        Args:
+            text (str): Sentence to show, and to sign if there is no gloss
+            gloss (str): Gloss tokens to sign instead, e.g. "ME WANT GO STORE";
+                words the gloss dropped are then never fingerspelled
+        """
+        # More of a streamed sentence arrived in time; signing carries on
+        taskMgr.remove("FinishSigningTask")
 
         # Store the text
         self.current_text = text.strip()
 
-        # Split the text into words
-        words = self.current_text.split()
-
-        # Create an expanded sequence of poses
-        self.expanded_sequence = self.expandPoseSequence(words)
+        # Sign the gloss when there is one, otherwise the words themselves
+        words = gloss.split() if gloss else self.current_text.split()
 
-        if not self.expanded_sequence:
+        # Interrupts anything already signing; each sign begins when the previous one finishes
+        if not self.signer.sign(self.current_text, words):
             self.status_text.setText("No valid signs found in text")
             self.signing_complete = True  # Mark as complete even though nothing happened
             return
 
-        self.status_text.setText(f"Signing: {self.current_text}")
-        self.pose_index = 0
-        self.is_animating = True
         self.signing_complete = False  # Signing is now in progress
 
         # If media control is active, pause media while signing
         if self.media_control_active and self.media_state == "playing":
             self.pause_media()
 
-        # Start animation task
-        taskMgr.add(self.animateNextPose, "SignAnimation")
-
-    def stopAnimation(self):
-        # Stop any running animation task
-        if self.is_animating:
-            taskMgr.remove("SignAnimation")
-            self.is_animating = False
-
-    def slideArms(self):
-        slide_distance = 0.5
-        time = 0.2  # Increased wait time between poses
-
-        sequence = Sequence(
-            LerpPosInterval(self.larm, time, self.larm.getPos()),
-            LerpPosInterval(self.rarm, time, self.rarm.getPos() + LVecBase3f(-slide_distance, 0, 0)),
-            LerpPosInterval(self.larm, time, self.larm.getPos()),
-            LerpPosInterval(self.rarm, time, self.rarm.getPos())
-        )
-        sequence.start()
-
-    def animateNextPose(self, task):
-        if self.pose_index >= len(self.expanded_sequence):
-            self.loadSignPoses("default")
-            self.pose_index = 0
-            self.is_animating = False
-            self.status_text.setText("Animation Complete")
-            self.current_pose = ""
-            self.signing_complete = True  # Signing is now complete
-
-            # If media control is active, resume media after signing
-            if self.media_control_active and self.media_state == "paused":
-                self.resume_media()
-
-            return Task.done
-
-        pose_name = self.expanded_sequence[self.pose_index]
-
-        # Check for same as previous
-        if self.current_pose == pose_name and len(pose_name) == 1:
-            self.slideArms()
-            self.pose_index += 1
-            return task.again
-
-        self.current_pose = pose_name
-        poses = self.gesture_data.get(pose_name)
-
-        if not poses:
-            self.pose_index += 1
-            return task.again
-
-        sequence = []
-        time = 0.05  # Slower movement between poses
-
-        def addFingerLerp(hand_data, finger_map):
-            if "fingers" not in hand_data:
-                return
-            for name, parts in finger_map.items():
-                if name in hand_data["fingers"]:
-                    for part, pose_data in zip(parts, hand_data["fingers"][name]):
-                        sequence.append(LerpPosInterval(part, 0, LVecBase3f(*pose_data["pos"])))
-                        sequence.append(LerpHprInterval(part, 0, LVecBase3f(*pose_data["hpr"])))
-
-        def addHandAndFingers(pose):
-            l = pose["leftHand"]
-            r = pose["rightHand"]
-            sequence.extend([
-                LerpPosInterval(self.larm, time, LVecBase3f(*l["pos"])),
-                LerpHprInterval(self.larm, time, LVecBase3f(*l["hpr"])),
-                LerpPosInterval(self.rarm, time, LVecBase3f(*r["pos"])),
-                LerpHprInterval(self.rarm, time, LVecBase3f(*r["hpr"]))
-            ])
-            addFingerLerp(l, {
-                "thumb": [self.lthumb1, self.lthumb2],
-                "index": [self.lindex1, self.lindex2, self.lindex3],
-                "middle": [self.lmiddle1, self.lmiddle2, self.lmiddle3],
-                "ring": [self.lring1, self.lring2, self.lring3],
-                "pinky": [self.lpinky1, self.lpinky2, self.lpinky3]
-            })
-            addFingerLerp(r, {
-                "thumb": [self.rthumb1, self.rthumb2],
-                "index": [self.rindex1, self.rindex2, self.rindex3],
-                "middle": [self.rmiddle1, self.rmiddle2, self.rmiddle3],
-                "ring": [self.rring1, self.rring2, self.rring3],
-                "pinky": [self.rpinky1, self.rpinky2, self.rpinky3]
-            })
-
-        if isinstance(poses, list):
-            for pose in poses:
-                addHandAndFingers(pose)
+    def finishAnimation(self):
+        # Streamed speech arrives a few words at a time; wait briefly for the rest of the
+        # sentence so media is not resumed and paused again between its pieces
+        if self.stream_speech:
+            taskMgr.doMethodLater(self.stream_finish_delay, self.finish_signing, "FinishSigningTask")
         else:
-            addHandAndFingers(poses)
-
-        # Execute the sequence
-        Sequence(*sequence).start()
-
-        # Update display to show current pose
-        self.status_text.setText(f"Signing: {self.current_text} ('{pose_name}')")
+            self.finish_signing()
 
-        # Move to next pose after a delay
-        task.delayTime = 1.5  # Long pause between signs
-        self.pose_index += 1
+    def finish_signing(self, task=None):
+        self.signing_complete = True  # Signing is now complete
 
-        # Schedule next pose animation
-        return task.again
+        # If media control is active, resume media after signing
+        if self.media_control_active and self.media_state == "paused":
+            self.resume_media()
 
     def setup_media_control(self):
         """Set up the media control system"""
@@ -658,7 +383,14 @@ class SignLanguageApp(ShowBase):
         """Start speech recognition automatically"""
         try:
             if not self.speech_processor:
-                self.speech_processor = ContinuousSpeechGloss(callback=self.handle_speech_result)
+                options = dict(
+                    callback=self.speech_results.push, streaming=self.stream_speech,
+                    lexicon_path="sign_poses.json" if self.use_speech_grammar else None
+                )
+                if self.speech_out_of_process:
+                    self.speech_processor = SpeechWorker(ContinuousSpeechGloss, **options)
+                else:
+                    self.speech_processor = ContinuousSpeechGloss(**options)
 
             success = self.speech_processor.start()
             if success:
@@ -695,18 +427,16 @@ class SignLanguageApp(ShowBase):
                 self.status_text.setText("Error: Failed to stop speech recognition")
 
     def handle_speech_result(self, text, gloss):
-        """Handle speech recognition results"""
+        """Handle speech recognition results, on the main thread once per frame"""
         if text and gloss:
             # Update display
             self.speech_text_label["text"] = f"Speech: {text}"
             self.speech_gloss_label["text"] = f"Gloss: {gloss}"
 
-            # If already animating, skip this input
-            if self.is_animating:
-                return
-
-            # Automatically sign the recognized text
-            self.start_animation(text)
+            # Queue the text; the signer takes it in order once the avatar is free
+            # Streamed pieces of a sentence are joined while they wait, so phrases still match
+            if not self.utterances.put(text, gloss, merge=self.stream_speech):
+                self.status_text.setText(f"Too much speech waiting, dropped: {text}")
 
 
 # Main entry point
@@ -0,0 +1,115 @@
+"""
+Co-articulated fingerspelling.
+
+A TransitionTable precomputes a short eased blend trajectory for every ordered
+pair of fingerspelling poses, so a run of letters can be streamed to the
+PoseBlender as one continuous keyframe sequence with no per-pair work at
+runtime.
+"""
+import numpy as np
+
+from pose_blend import CompiledTimeline
+from pose_library import JOINT_COUNT, JOINT_NAMES, FLOATS_PER_JOINT
+
+RARM = JOINT_NAMES.index("rarm")
+
+
+def fingerspelling_names(library):
+    """Return the single-letter entries of a library plus the rest pose"""
+    names = [name for name in library if len(name) == 1]
+    if "default" in library:
+        names.append("default")
+    return names
+
+
+class TransitionTable:
+    """
+    Blend trajectories between the end of one pose and the start of another.
+
+    trajectories[a, b] holds `steps` intermediate poses on a smoothstep curve
+    from the last frame of entry a to the first frame of entry b. Joints an
+    entry never sets are taken from the rest pose.
+    """
+
+    def __init__(self, library, names=None, steps=3, rest="default"):
+        """
+        Precompute the table.
+
+        Args:
+            library (PoseLibrary): Pose library to read entries from
+            names (list): Entries to include, defaults to fingerspelling_names(library)
+            steps (int): Intermediate poses per transition
+            rest (str): Entry used for joints a pose leaves unset
+        """
+        self.names = list(names) if names is not None else fingerspelling_names(library)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.steps = steps
+
+        rest_clip = library.clip(rest)
+        rest_pose = np.nan_to_num(rest_clip.values[0]) if rest_clip else np.zeros((JOINT_COUNT, FLOATS_PER_JOINT), np.float32)
+
+        # Fully specified keyframes per entry, and each entry's first and last pose
+        self.keyframes = []
+        starts = np.empty((len(self.names), JOINT_COUNT, FLOATS_PER_JOINT), dtype=np.float32)
+        ends = np.empty_like(starts)
+        for i, name in enumerate(self.names):
+            timeline = CompiledTimeline(library.clip(name))
+            frames = np.where(timeline.unset, rest_pose, timeline.filled).astype(np.float32)
+            self.keyframes.append(frames)
+            starts[i] = frames[0]
+            ends[i] = frames[-1]
+
+        t = np.linspace(0.0, 1.0, steps + 2, dtype=np.float32)[1:-1]
+        weights = (t * t * (3 - 2 * t))[None, None, :, None, None]
+        self.trajectories = ends[:, None, None] + (starts[None, :, None] - ends[:, None, None]) * weights
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def trajectory(self, from_name, to_name):
+        """Return the (steps, JOINT_COUNT, 6) transition between two entries"""
+        return self.trajectories[self.index[from_name], self.index[to_name]]
+
+    def stream(self, letters, transition_time=0.15, frame_time=0.2, hold_time=0.3, slide=0.5):
+        """
+        Build one continuous keyframe stream for a run of letters.
+
+        The first letter is blended into from wherever the avatar is; each
+        following letter arrives through its precomputed transition. A doubled
+        letter slides the right hand aside and back instead, as slideArms does.
+
+        Args:
+            letters (list): Entry names, all present in the table
+            transition_time (float): Seconds for each letter-to-letter transition
+            frame_time (float): Seconds between keyframes inside a letter
+            hold_time (float): Seconds each letter is held once formed
+            slide (float): Right-hand slide distance for a repeated letter
+
+        Returns:
+            tuple: (poses, durations) for PoseBlender.play_keys
+        """
+        poses = []
+        durations = []
+        step_time = transition_time / (self.steps + 1)
+        previous = None
+        for name in letters:
+            frames = self.keyframes[self.index[name]]
+            if previous is None:
+                durations.append(transition_time)
+            elif previous == name:
+                slid = frames[0].copy()
+                slid[RARM, 0] -= slide
+                poses.append(slid[None])
+                durations.append(transition_time)
+                durations.append(transition_time)
+            else:
+                poses.append(self.trajectory(previous, name))
+                durations.extend([step_time] * self.steps)
+                durations.append(step_time)
+            poses.append(frames)
+            durations.extend([frame_time] * (len(frames) - 1))
+            # Hold the formed letter before moving on
+            poses.append(frames[-1:])
+            durations.append(hold_time)
+            previous = name
+        return np.concatenate(poses), np.array(durations)
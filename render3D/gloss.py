@@ -0,0 +1,117 @@
+"""
+English text to sign gloss translation.
+
+Tokenization is a single precompiled regex and the stopword filter is a
+frozenset, so a sentence is translated in microseconds without importing
+NLTK; recent sentences are also kept in a small LRU since recognizers tend
+to repeat themselves. NLTK's tokenizer can still be used as a fallback.
+"""
+import re
+from collections import OrderedDict
+
+from morphology import Lemmatizer
+
+# NLTK's English stopword list, so NLTK is not needed to load it
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't couldn
+couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't ma mightn
+mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't weren weren't
+won won't wouldn wouldn't
+""".split())
+
+# Stopwords that still carry meaning in sign language
+KEEP_WORDS = frozenset({'i', 'you', 'we', 'he', 'she', 'they', 'me', 'my', 'your', 'our', 'his', 'her', 'their'})
+
+# Words with their contractions ("don't"); punctuation and whitespace separate tokens
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)*")
+
+
+class GlossTranslator:
+    """
+    Maps text to gloss through a word -> gloss dictionary.
+
+    Stopwords are dropped unless the gloss map has an entry for them, words
+    that map to an empty gloss are dropped, inflected forms of mapped words
+    ("helping") use their base form's gloss, and anything else not in the
+    map is upper-cased as its own gloss.
+    """
+
+    def __init__(self, gloss_map, stop_words=STOP_WORDS - KEEP_WORDS, cache_size=256, use_nltk=False,
+                 lemmatize=True):
+        """
+        Create a translator.
+
+        Args:
+            gloss_map (dict): Lower-case word to gloss; may be updated later
+            stop_words (set): Words dropped unless they are in gloss_map
+            cache_size (int): Recent sentences remembered
+            use_nltk (bool): Tokenize with nltk.word_tokenize if NLTK is installed
+            lemmatize (bool): Look up inflected words by their base form
+        """
+        self.gloss_map = gloss_map
+        self.stop_words = frozenset(stop_words)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._map_size = len(gloss_map)
+        self.lemmatizer = Lemmatizer(self._content_words(), exclude=STOP_WORDS) if lemmatize else None
+        self._tokenize = TOKEN_RE.findall
+        if use_nltk:
+            try:
+                from nltk.tokenize import word_tokenize
+                self._tokenize = lambda text: [word for word in word_tokenize(text) if TOKEN_RE.fullmatch(word)]
+            except ImportError:
+                print("NLTK not available, using the built-in tokenizer")
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def _content_words(self):
+        # Only words that are signed can be the base of an inflected form
+        return [word for word, sign in self.gloss_map.items() if sign and " " not in word]
+
+    def tokenize(self, text):
+        return self._tokenize(text.lower())
+
+    def translate(self, text):
+        """Return the gloss string for a sentence"""
+        # Entries added to the gloss map invalidate what was cached
+        if len(self.gloss_map) != self._map_size:
+            self._map_size = len(self.gloss_map)
+            self._cache.clear()
+            if self.lemmatizer:
+                self.lemmatizer.rebuild(self._content_words())
+
+        gloss = self._cache.get(text)
+        if gloss is not None:
+            self._cache.move_to_end(text)
+            self.hits += 1
+            return gloss
+
+        self.misses += 1
+        gloss_map = self.gloss_map
+        stop_words = self.stop_words
+        lemmatizer = self.lemmatizer
+        glosses = []
+        for word in self.tokenize(text):
+            sign = gloss_map.get(word)
+            if sign is None:
+                if word in stop_words:
+                    continue
+                lemma = lemmatizer.lemma(word) if lemmatizer else None
+                sign = gloss_map.get(lemma) if lemma else word.upper()
+            if sign:
+                glosses.append(sign)
+        gloss = " ".join(glosses)
+
+        self._cache[text] = gloss
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return gloss
@@ -0,0 +1,201 @@
+"""
+Compiled, memory-mapped English to gloss dictionary.
+
+The source dictionary (gloss_map.json, or a tab-separated word/gloss file
+for very large vocabularies) is compiled into a flat binary file: a sorted
+index of fixed-size records followed by the key and gloss strings. The
+compiled file is opened with mmap and binary-searched in place, so loading
+costs nothing however many entries it has, and every process using it
+shares the same pages.
+
+Usage:
+    python gloss_dictionary.py compile gloss_map.json [-o gloss_map.glossidx]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"GLDX"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHxxIQI")  # magic, version, entries, digest, strings offset
+INDEX_RECORD = struct.Struct("<IHIH")  # word offset, word length, gloss offset, gloss length
+COMPILED_SUFFIX = ".glossidx"
+
+
+def compiled_path(source_path):
+    """Return the path of the compiled dictionary for a source file"""
+    return os.path.splitext(source_path)[0] + COMPILED_SUFFIX
+
+
+def _read_source(source):
+    """Parse a JSON object or word<TAB>gloss lines into a dict"""
+    text = source.decode("utf-8")
+    if text.lstrip().startswith("{"):
+        return json.loads(text)
+    entries = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            word, _, gloss = line.partition("\t")
+            entries[word] = gloss
+    return entries
+
+
+def compile_dictionary(source_path, out_path=None):
+    """
+    Compile a gloss dictionary into a binary index.
+
+    Args:
+        source_path (str): Path to the JSON or tab-separated dictionary
+        out_path (str): Output path, defaults to the source path with a .glossidx suffix
+
+    Returns:
+        str: Path of the written index
+    """
+    out_path = out_path or compiled_path(source_path)
+    with open(source_path, "rb") as f:
+        source = f.read()
+    entries = sorted((word.lower().encode("utf-8"), gloss.encode("utf-8"))
+                     for word, gloss in _read_source(source).items())
+
+    index = bytearray()
+    strings = bytearray()
+    for word, gloss in entries:
+        word_offset = len(strings)
+        strings += word
+        index += INDEX_RECORD.pack(word_offset, len(word), len(strings), len(gloss))
+        strings += gloss
+
+    digest = int.from_bytes(hashlib.blake2b(source, digest_size=8).digest(), "little")
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), digest, HEADER.size + len(index)))
+        f.write(index)
+        f.write(strings)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class GlossDictionary:
+    """
+    Read-only mapping of lower-case words to gloss strings.
+
+    Supports the dict operations the gloss translator uses (get, in, len,
+    iteration over words); an empty gloss means the word is not signed.
+    """
+
+    def __init__(self, path):
+        """
+        Open a compiled dictionary.
+
+        Args:
+            path (str): Path to a .glossidx file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._entry_count, self.digest, self._strings_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a compatible gloss dictionary, recompile it")
+
+    def close(self):
+        self._map.close()
+
+    def _record(self, i):
+        return INDEX_RECORD.unpack_from(self._map, HEADER.size + i * INDEX_RECORD.size)
+
+    def _word(self, i):
+        word_offset, word_len = self._record(i)[:2]
+        start = self._strings_offset + word_offset
+        return self._map[start:start + word_len]
+
+    def _find(self, word):
+        """Binary search for a word, returning its index position or -1"""
+        key = word.encode("utf-8")
+        lo, hi = 0, self._entry_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._entry_count and self._word(lo) == key:
+            return lo
+        return -1
+
+    def __len__(self):
+        return self._entry_count
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self._find(word) >= 0
+
+    def __iter__(self):
+        for i in range(self._entry_count):
+            yield self._word(i).decode("utf-8")
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        """Yield (word, gloss) pairs in word order without a search per word"""
+        strings = self._strings_offset
+        for i in range(self._entry_count):
+            word_offset, word_len, gloss_offset, gloss_len = self._record(i)
+            yield (self._map[strings + word_offset:strings + word_offset + word_len].decode("utf-8"),
+                   self._map[strings + gloss_offset:strings + gloss_offset + gloss_len].decode("utf-8"))
+
+    def get(self, word, default=None):
+        i = self._find(word)
+        if i < 0:
+            return default
+        gloss_offset, gloss_len = self._record(i)[2:]
+        start = self._strings_offset + gloss_offset
+        return self._map[start:start + gloss_len].decode("utf-8")
+
+    def __getitem__(self, word):
+        gloss = self.get(word)
+        if gloss is None:
+            raise KeyError(word)
+        return gloss
+
+
+def load_gloss_dictionary(source_path):
+    """
+    Open the compiled index for a gloss dictionary, recompiling it if it is missing or stale.
+
+    Args:
+        source_path (str): Path to the JSON or tab-separated dictionary
+
+    Returns:
+        GlossDictionary: The memory-mapped dictionary
+    """
+    path = compiled_path(source_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source_path):
+        compile_dictionary(source_path, path)
+    return GlossDictionary(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gloss dictionary tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser("compile", help="Compile a gloss dictionary into a binary index")
+    compile_parser.add_argument("sources", nargs="+", help="JSON or tab-separated dictionaries to compile")
+    compile_parser.add_argument("-o", "--output", help="Output path (only with a single input file)")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.sources) > 1:
+        parser.error("--output can only be used with a single input file")
+
+    for source_path in args.sources:
+        out_path = compile_dictionary(source_path, args.output)
+        dictionary = GlossDictionary(out_path)
+        print(f"Compiled {len(dictionary)} entries from {source_path} into {out_path}")
+        dictionary.close()
+
+
+if __name__ == "__main__":
+    main()
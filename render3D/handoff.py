@@ -0,0 +1,94 @@
+"""
+Handoff from worker threads into the Panda3D task loop.
+
+Scene graph and DirectGUI objects may only be touched from the main thread.
+Producers push items onto a FrameHandoff from any thread; a task drains it
+once per frame and hands the whole burst to the consumer in one call, so
+per-frame work stays bounded however fast results arrive.
+"""
+from collections import deque
+
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+
+
+def join_results(batch):
+    """
+    Merge a burst of (text, gloss) results into one.
+
+    Results without a gloss (status and error messages) are only kept if
+    nothing else arrived.
+    """
+    signable = [item for item in batch if item[1]]
+    if not signable:
+        return batch[-1]
+    return " ".join(text for text, _ in signable), " ".join(gloss for _, gloss in signable)
+
+
+class FrameHandoff:
+    """
+    Single-producer/single-consumer queue drained by a main-thread task.
+
+    deque.append and popleft are atomic, so neither side takes a lock.
+    """
+
+    def __init__(self, consumer, merge=None, task_name="FrameHandoff"):
+        """
+        Create the queue and start draining it.
+
+        Args:
+            consumer (function): Called on the main thread with the items of a push
+            merge (function): Combines a frame's list of items into one; without it
+                the consumer is called once per item
+            task_name (str): Name of the draining task
+        """
+        self.consumer = consumer
+        self.merge = merge
+        self.task_name = task_name
+        self._items = deque()
+
+        # Metrics
+        self.pushed = 0
+        self.delivered = 0
+        self.batches = 0
+        self.max_batch = 0
+
+        taskMgr.add(self._drain, self.task_name)
+
+    def __len__(self):
+        return len(self._items)
+
+    def push(self, *item):
+        """Queue an item for the consumer; safe to call from any thread"""
+        self._items.append(item)
+        self.pushed += 1
+
+    def destroy(self):
+        taskMgr.remove(self.task_name)
+        self._items.clear()
+
+    def _drain(self, task):
+        if not self._items:
+            return Task.cont
+
+        # Take only what is there now; later pushes wait for the next frame
+        batch = [self._items.popleft() for _ in range(len(self._items))]
+        self.delivered += len(batch)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(batch))
+
+        if self.merge:
+            self.consumer(*self.merge(batch))
+        else:
+            for item in batch:
+                self.consumer(*item)
+        return Task.cont
+
+    def stats(self):
+        return {
+            "pending": len(self._items),
+            "pushed": self.pushed,
+            "batches": self.batches,
+            "coalesced": self.delivered - self.batches if self.merge else 0,
+            "max_batch": self.max_batch,
+        }
@@ -0,0 +1,121 @@
+"""
+Interval lifecycle management.
+
+Every interval the animator starts goes through an IntervalPool. The pool
+holds a reference while the interval plays, puts it back on a per-key free
+list when it finishes and hands it out again instead of building a new one,
+so the number of live intervals is bounded by how many overlap rather than
+by how long the session runs.
+"""
+from direct.interval.IntervalGlobal import ivalMgr
+from direct.showbase.DirectObject import DirectObject
+
+
+class IntervalPool(DirectObject):
+    """
+    Owns, recycles and cancels a family of intervals.
+
+    acquire(key, build) returns an idle interval for key or builds one; the
+    caller retargets it as needed and passes it to start(), which returns the
+    event sent when it finishes. Intervals with the same key must be
+    interchangeable once retargeted.
+    """
+
+    def __init__(self, name="Intervals"):
+        """
+        Create an empty pool.
+
+        Args:
+            name (str): Prefix for the done events of intervals the pool builds
+        """
+        DirectObject.__init__(self)
+        self.name = name
+        self._free = {}    # key -> idle intervals
+        self._keys = {}    # done event -> key, for every interval built
+        self._active = {}  # done event -> playing interval
+        self._serial = 0
+
+        # Metrics
+        self.built = 0
+        self.reused = 0
+        self.started = 0
+        self.finished = 0
+        self.cancelled = 0
+
+    def __len__(self):
+        return len(self._active)
+
+    def acquire(self, key, build, *args):
+        """
+        Return an idle interval for key, building one with build(*args) if none is free.
+
+        Args:
+            key (hashable): Identifies interchangeable intervals
+            build (function): Returns a new interval
+        """
+        free = self._free.get(key)
+        if free:
+            self.reused += 1
+            return free.pop()
+
+        interval = build(*args)
+        self._serial += 1
+        done_event = f"{self.name}-{self._serial}-done"
+        interval.setDoneEvent(done_event)
+        self._keys[done_event] = key
+        self.built += 1
+        return interval
+
+    def start(self, interval):
+        """
+        Start an acquired interval.
+
+        Returns:
+            str: Event sent when the interval finishes
+        """
+        done_event = interval.getDoneEvent()
+        self._active[done_event] = interval
+        self.acceptOnce(done_event, self._release, [done_event])
+        interval.start()
+        self.started += 1
+        return done_event
+
+    def _release(self, done_event):
+        interval = self._active.pop(done_event, None)
+        if interval is not None:
+            self._free.setdefault(self._keys[done_event], []).append(interval)
+            self.finished += 1
+
+    def _cancel(self, stop):
+        for done_event, interval in list(self._active.items()):
+            self.ignore(done_event)
+            stop(interval)
+            self._free.setdefault(self._keys[done_event], []).append(interval)
+            self.cancelled += 1
+        self._active.clear()
+
+    def pause_all(self):
+        """Stop every playing interval where it is, without sending its done event"""
+        self._cancel(lambda interval: interval.pause())
+
+    def finish_all(self):
+        """Jump every playing interval to its end"""
+        self._cancel(lambda interval: interval.finish())
+
+    def destroy(self):
+        self.finish_all()
+        self.ignoreAll()
+        self._free.clear()
+        self._keys.clear()
+
+    def stats(self):
+        return {
+            "active": len(self._active),
+            "idle": sum(len(free) for free in self._free.values()),
+            "built": self.built,
+            "reused": self.reused,
+            "started": self.started,
+            "finished": self.finished,
+            "cancelled": self.cancelled,
+            "manager": ivalMgr.getNumIntervals(),
+        }
@@ -0,0 +1,113 @@
+"""
+Inflected forms for lexicon lookups.
+
+Lexicon lookups are exact, so "helping", "wanted" and "stores" would miss
+HELP, WANT and STORE and be fingerspelled. A Lemmatizer precomputes a lemma
+table from the lexicon: the regular inflections of every content word
+(-s, -es, -ies, -ed, -ing, with doubled consonants and dropped e) and the
+irregular forms below, each mapped to its base word. A lookup is a single
+dict get, and only forms of words the lexicon really has are ever matched,
+so "noted" cannot turn into "not" or "thing" into "the". Function words are
+left out of the table altogether.
+"""
+
+# Irregular forms -> base form
+IRREGULAR = {
+    "am": "be", "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "being": "be",
+    "has": "have", "had": "have", "having": "have",
+    "does": "do", "did": "do", "done": "do", "doing": "do",
+    "goes": "go", "went": "go", "gone": "go",
+    "made": "make", "said": "say", "saw": "see", "seen": "see", "came": "come",
+    "got": "get", "gotten": "get", "gave": "give", "given": "give", "took": "take", "taken": "take",
+    "knew": "know", "known": "know", "thought": "think", "told": "tell", "felt": "feel",
+    "found": "find", "kept": "keep", "brought": "bring", "bought": "buy",
+    "ate": "eat", "eaten": "eat", "drank": "drink", "ran": "run",
+    "wrote": "write", "written": "write", "spoke": "speak", "spoken": "speak",
+    "met": "meet", "sat": "sit", "stood": "stand", "slept": "sleep", "taught": "teach",
+    "understood": "understand", "forgot": "forget", "forgotten": "forget",
+    "began": "begin", "begun": "begin", "sent": "send", "paid": "pay", "lost": "lose",
+    "children": "child", "people": "person", "men": "man", "women": "woman",
+    "feet": "foot", "teeth": "tooth", "mice": "mouse",
+}
+
+MIN_STEM = 3  # Shorter words are not inflected ("is" would come from "i")
+MIN_SUFFIX_STEM = 4  # Shortest word given -s, -es or -d forms ("news" is not "new" + s)
+
+VOWELS = frozenset("aeiou")
+
+
+def inflections(word):
+    """Regular inflected forms of a base word"""
+    forms = []
+    if len(word) < MIN_STEM or not word.isalpha():
+        return forms
+    last = word[-1]
+    consonant_y = last == "y" and word[-2] not in VOWELS
+
+    if word.endswith("ie"):
+        forms.append(word[:-2] + "ying")  # tie -> tying
+    elif last == "e" and not word.endswith("ee"):
+        forms.append(word[:-1] + "ing")  # like -> liking
+    else:
+        forms.append(word + "ing")
+
+    if consonant_y:
+        forms.append(word[:-1] + "ied")  # study -> studied
+    elif last != "e":
+        forms.append(word + "ed")
+    elif len(word) >= MIN_SUFFIX_STEM:
+        forms.append(word + "d")  # like -> liked
+
+    # stop -> stopped, stopping; one-syllable words only take the doubled forms,
+    # so "hoping" stays with hope rather than hop
+    if last not in VOWELS and last not in "wxy" and word[-2] in VOWELS and word[-3] not in VOWELS:
+        if sum(letter in VOWELS for letter in word) == 1:
+            forms = forms[:-2] if forms[-1].endswith("ed") else forms[:-1]
+        forms.append(word + last + "ed")
+        forms.append(word + last + "ing")
+
+    if len(word) >= MIN_SUFFIX_STEM:
+        if consonant_y:
+            forms.append(word[:-1] + "ies")  # study -> studies
+        elif word.endswith(("s", "x", "z", "ch", "sh")):
+            forms.append(word + "es")  # watch -> watches
+        else:
+            forms.append(word + "s")
+    return forms
+
+
+class Lemmatizer:
+    """
+    Maps inflected words to the content word a lexicon knows them by.
+    """
+
+    def __init__(self, words, exclude=frozenset(), irregular=IRREGULAR):
+        """
+        Build the lemma table.
+
+        Args:
+            words (iterable): Content words of the lexicon, e.g. words with a non-empty gloss
+            exclude (set): Words never used as a base, such as stopwords
+            irregular (dict): Irregular form -> base form table
+        """
+        self.exclude = exclude
+        self.irregular = irregular
+        self.rebuild(words)
+
+    def rebuild(self, words):
+        """Recompute the table after the lexicon changed"""
+        bases = {word for word in words if word and word not in self.exclude}
+        table = {form: base for form, base in self.irregular.items() if base in bases}
+        for base in sorted(bases):
+            for form in inflections(base):
+                # A form that is a word in its own right keeps its own meaning
+                if form not in bases:
+                    table.setdefault(form, base)
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def lemma(self, word):
+        """Return the lexicon word an inflected word belongs to, or None"""
+        return self.table.get(word)
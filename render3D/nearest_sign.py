@@ -0,0 +1,154 @@
+"""
+Nearest-sign fallback for words the lexicon does not have.
+
+Offline, every word of a word-embedding file (GloVe or word2vec text
+format) is compared against the embeddings of the pose library's entries,
+and the closest entry and its cosine similarity are written to a
+word<TAB>entry<TAB>similarity table. At runtime that table is compiled
+and memory-mapped like the gloss dictionary, so finding the nearest sign
+for an unknown word is a single lookup with no vectors loaded at all.
+
+Usage:
+    python nearest_sign.py build glove.6B.300d.txt sign_poses.json [-o nearest_signs.tsv]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from gloss_dictionary import load_gloss_dictionary
+from pose_library import load_pose_library
+
+CHUNK_ROWS = 8192
+
+
+def signable_entries(library):
+    """Pose library entries worth substituting for another word (not letters or the rest pose)"""
+    return [name for name in library if len(name) > 1 and name != "default"]
+
+
+def _read_vectors(path):
+    """Yield (word, vector) from a GloVe or word2vec text file"""
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line_number, line in enumerate(f):
+            parts = line.rstrip().split(" ")
+            if line_number == 0 and len(parts) == 2:
+                continue  # word2vec header: vocabulary size and dimension
+            if len(parts) > 2:
+                yield parts[0], np.asarray(parts[1:], dtype=np.float32)
+
+
+def build_table(embedding_path, lexicon_path, out_path="nearest_signs.tsv", min_similarity=0.5):
+    """
+    Precompute the nearest pose library entry for every word in an embedding file.
+
+    Args:
+        embedding_path (str): Word vectors in GloVe or word2vec text format
+        lexicon_path (str): Pose library JSON
+        out_path (str): Table to write
+        min_similarity (float): Words whose nearest entry is less similar are left out
+
+    Returns:
+        int: Number of words written
+    """
+    library = load_pose_library(lexicon_path)
+    entries = signable_entries(library)
+    library.close()
+    entry_set = set(entries)
+
+    # Entry vectors: phrases ("thank you") use the mean of their words
+    entry_words = [name.lower().replace("_", " ").split() for name in entries]
+    wanted = {word for words in entry_words for word in words}
+    found = {word: vector for word, vector in _read_vectors(embedding_path) if word in wanted}
+    names = []
+    vectors = []
+    for name, words in zip(entries, entry_words):
+        if all(word in found for word in words):
+            names.append(name)
+            vectors.append(np.mean([found[word] for word in words], axis=0))
+    if not names:
+        raise ValueError("None of the pose library entries have word vectors")
+    signs = np.array(vectors, dtype=np.float32)
+    signs /= np.linalg.norm(signs, axis=1, keepdims=True)
+
+    written = 0
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write(f"# Nearest sign for {embedding_path} against {lexicon_path}\n")
+        chunk_words = []
+        chunk_vectors = []
+
+        def flush():
+            nonlocal written
+            block = np.array(chunk_vectors, dtype=np.float32)
+            block /= np.linalg.norm(block, axis=1, keepdims=True) + 1e-12
+            similarity = block @ signs.T
+            best = similarity.argmax(axis=1)
+            scores = similarity[np.arange(len(best)), best]
+            for word, index, score in zip(chunk_words, best, scores):
+                if score >= min_similarity and word not in entry_set:
+                    out.write(f"{word}\t{names[index]}\t{score:.3f}\n")
+                    written += 1
+            chunk_words.clear()
+            chunk_vectors.clear()
+
+        for word, vector in _read_vectors(embedding_path):
+            if len(vector) != signs.shape[1]:
+                continue
+            chunk_words.append(word.lower())
+            chunk_vectors.append(vector)
+            if len(chunk_words) == CHUNK_ROWS:
+                flush()
+        if chunk_words:
+            flush()
+    return written
+
+
+class NearestSigns:
+    """
+    Looks up the closest signable entry for a word in a precomputed table.
+    """
+
+    def __init__(self, table_path, threshold=0.6):
+        """
+        Open a table written by build_table, compiling it if needed.
+
+        Args:
+            table_path (str): Path to the word<TAB>entry<TAB>similarity table
+            threshold (float): Lowest similarity accepted as a substitute
+        """
+        self.table = load_gloss_dictionary(table_path)
+        self.threshold = threshold
+
+    def lookup(self, word):
+        """Return the nearest entry name for a word, or None if nothing is close enough"""
+        value = self.table.get(word)
+        if value is None:
+            return None
+        name, _, similarity = value.rpartition("\t")
+        return name if float(similarity) >= self.threshold else None
+
+
+def load_nearest_signs(table_path="nearest_signs.tsv", threshold=0.6):
+    """Return NearestSigns for a table, or None if it has not been built"""
+    if not os.path.exists(table_path):
+        return None
+    return NearestSigns(table_path, threshold)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nearest-sign table tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Precompute the nearest sign for every word in an embedding file")
+    build_parser.add_argument("embeddings", help="Word vectors in GloVe or word2vec text format")
+    build_parser.add_argument("lexicon", help="Pose library JSON")
+    build_parser.add_argument("-o", "--output", default="nearest_signs.tsv", help="Table to write")
+    build_parser.add_argument("--min-similarity", type=float, default=0.5,
+                              help="Leave out words whose nearest sign is less similar")
+    args = parser.parse_args(argv)
+
+    written = build_table(args.embeddings, args.lexicon, args.output, args.min_similarity)
+    print(f"Wrote nearest signs for {written} words to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
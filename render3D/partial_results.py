@@ -0,0 +1,109 @@
+"""
+Early commitment of streaming recognizer output.
+
+Vosk's PartialResult() keeps rewriting the tail of the hypothesis while the
+speaker is talking, but words further back settle quickly. PrefixStabilizer
+commits a word once it has appeared at the same position in several
+consecutive partials, so signing can start long before the final result,
+and reconciles what was committed with the final transcript.
+"""
+import time
+from difflib import SequenceMatcher
+
+
+class PrefixStabilizer:
+    """
+    Tracks the committed prefix of one utterance.
+
+    A word is committed when the last `agreement` partials all agree on it
+    and it is not among the last `holdback` words of the newest partial.
+    Committed words are never taken back, so a final result that disagrees
+    is aligned with them: final words that match a committed word were
+    already signed, and every other final word is returned in order. The
+    disagreement is counted in `revisions`.
+    """
+
+    def __init__(self, agreement=2, holdback=1):
+        """
+        Create a stabilizer for a fresh utterance.
+
+        Args:
+            agreement (int): Consecutive partials that must agree on a word
+            holdback (int): Trailing words of a partial that are never committed
+        """
+        self.agreement = agreement
+        self.holdback = holdback
+
+        # Metrics
+        self.early_words = 0    # Words committed from partials
+        self.final_words = 0    # Words only committed by a final result
+        self.revisions = 0      # Finals that contradicted a committed word
+        self.first_commit_latency = None  # Seconds from first partial to first commit, last utterance
+
+        self.reset()
+
+    def reset(self):
+        self.committed = []
+        self._history = []
+        self._started_at = None
+
+    def partial(self, words):
+        """
+        Feed the words of a partial result.
+
+        Returns:
+            list: Words newly committed by this partial
+        """
+        if not words:
+            return []
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+
+        self._history.append(words)
+        del self._history[:-self.agreement]
+        if len(self._history) < self.agreement:
+            return []
+
+        limit = min(len(h) for h in self._history[:-1])
+        limit = min(limit, len(words) - self.holdback)
+        start = len(self.committed)
+        stable = start
+        while stable < limit and all(h[stable] == words[stable] for h in self._history):
+            stable += 1
+        if stable <= start or self.committed != words[:start]:
+            return []
+
+        new_words = words[start:stable]
+        if not self.committed:
+            self.first_commit_latency = time.monotonic() - self._started_at
+        self.committed.extend(new_words)
+        self.early_words += len(new_words)
+        return new_words
+
+    def final(self, words):
+        """
+        Feed the final result and start a new utterance.
+
+        Returns:
+            list: Final words not already committed, still to be signed
+        """
+        start = len(self.committed)
+        if self.committed == words[:start]:
+            remaining = words[start:]
+        else:
+            # "i want to" committed, final "i wanna go home": sign "wanna go home"
+            self.revisions += 1
+            matcher = SequenceMatcher(None, self.committed, words, autojunk=False)
+            remaining = [word for tag, _, _, j1, j2 in matcher.get_opcodes() if tag != "equal"
+                         for word in words[j1:j2]]
+        self.final_words += len(remaining)
+        self.reset()
+        return remaining
+
+    def stats(self):
+        return {
+            "early_words": self.early_words,
+            "final_words": self.final_words,
+            "revisions": self.revisions,
+            "first_commit_latency": self.first_commit_latency,
+        }
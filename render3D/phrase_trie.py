@@ -0,0 +1,113 @@
+"""
+Phrase lookup over the sign lexicon.
+
+Lexicon entries may span several words ("thank you", or "thank_you" as a
+pose name). PhraseTrie indexes entries by word so a sentence can be matched
+greedily, longest phrase first, in a single left-to-right pass. Inflected
+words are reduced to a base form the lexicon knows ("helping" -> "help"),
+misspellings are corrected to lexicon words ("helo" -> "hello"),
+unknown words can be replaced by the nearest sign from a precomputed
+table, and only what is left is fingerspelled.
+"""
+from gloss import STOP_WORDS
+from morphology import Lemmatizer
+from spelling import SpellCorrector
+
+
+class PhraseTrie:
+    """
+    Word-level trie of lexicon entry names.
+    """
+
+    def __init__(self, names, lemmatize=True, known_words=None, nearest=None):
+        """
+        Build the trie.
+
+        Args:
+            names (iterable): Entry names, e.g. a PoseLibrary; words are separated
+                by spaces or underscores
+            lemmatize (bool): Match inflected words by their base form
+            known_words (set): Real words, see spelling.load_word_list; if given, other
+                words a small edit distance from a lexicon word are matched to it
+            nearest (NearestSigns): Substitutes for words no entry covers, optional
+        """
+        self.root = {}
+        self.names = set()
+        self.words = set()  # Every word of every entry
+        self.letters = set()
+        self.longest = 0
+        for name in names:
+            words = name.lower().replace("_", " ").split()
+            if not words:
+                continue
+            self.names.add(name)
+            self.words.update(words)
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            node[None] = name  # Entry ending at this node
+            self.longest = max(self.longest, len(words))
+            if len(name) == 1:
+                self.letters.add(name)
+        self.lemmatizer = Lemmatizer(self.words, exclude=STOP_WORDS) if lemmatize else None
+        self.speller = SpellCorrector(self.words, known_words) if known_words else None
+        self.nearest = nearest
+
+    def longest_match(self, words, start=0):
+        """
+        Find the longest entry starting at words[start].
+
+        Returns:
+            tuple: (entry name, words matched), or (None, 0) if nothing matches
+        """
+        node = self.root
+        match = (None, 0)
+        for i in range(start, len(words)):
+            node = node.get(words[i])
+            if node is None:
+                break
+            if None in node:
+                match = (node[None], i - start + 1)
+        return match
+
+    def _normalize(self, word):
+        """Return the lexicon word a token stands for, or the token itself"""
+        if word in self.words:
+            return word
+        if self.lemmatizer:
+            lemma = self.lemmatizer.lemma(word)
+            if lemma:
+                return lemma
+        if self.speller:
+            corrected = self.speller.correct(word)
+            if corrected:
+                return corrected
+        return word
+
+    def expand(self, words):
+        """
+        Turn words into entry names, fingerspelling words no entry covers.
+
+        Args:
+            words (list): Words of a sentence
+
+        Returns:
+            list: Entry names to sign, in order
+        """
+        words = [self._normalize(word.lower()) for word in words]
+        result = []
+        i = 0
+        while i < len(words):
+            name, length = self.longest_match(words, i)
+            if name is not None:
+                result.append(name)
+                i += length
+                continue
+
+            name = self.nearest.lookup(words[i]) if self.nearest else None
+            if name is not None and name in self.names:
+                result.append(name)
+            else:
+                result.extend(letter for letter in words[i] if letter in self.letters)
+            i += 1
+        return result
@@ -0,0 +1,199 @@
+"""
+Whole-body pose blending.
+
+A single per-frame task interpolates the full joint vector (both arm roots and
+all finger segments) with NumPy and only writes the NodePaths whose values
+changed, instead of building a Sequence of Lerp intervals for every sign.
+"""
+import numpy as np
+from direct.showbase.MessengerGlobal import messenger
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import ClockObject
+
+from pose_library import JOINT_COUNT, FLOATS_PER_JOINT
+from timeline_cache import TimelineCache
+
+
+class CompiledTimeline:
+    """
+    A clip's keyframes with gaps filled forward, ready to copy into the blend buffer.
+
+    unset marks values no keyframe up to that point has set; those come from
+    the pose the blend starts from.
+    """
+
+    __slots__ = ("name", "filled", "unset")
+
+    def __init__(self, clip):
+        self.name = clip.name
+        filled = np.array(clip.values, dtype=np.float32)
+        for k in range(1, len(filled)):
+            gaps = np.isnan(filled[k])
+            filled[k][gaps] = filled[k - 1][gaps]
+        self.unset = np.isnan(filled)
+        self.filled = filled
+
+    @property
+    def nbytes(self):
+        return self.filled.nbytes + self.unset.nbytes
+
+
+def compile_timeline(clip):
+    """Build a CompiledTimeline, returning it with its size for TimelineCache"""
+    timeline = CompiledTimeline(clip)
+    return timeline, timeline.nbytes
+
+
+class PoseBlender:
+    """
+    Drives a JOINT_NAMES-ordered list of NodePaths through keyframed poses.
+
+    Keyframes are blended linearly, each over its own duration, starting from
+    whatever pose the joints are in when play() is called. Joints a keyframe
+    leaves out (NaN) hold their previous value. done_event is sent when a
+    blend reaches its last keyframe.
+    """
+
+    def __init__(self, joints, task_name="PoseBlend", max_frames=16, cache=None):
+        """
+        Create the blender and start its update task.
+
+        Args:
+            joints (list): NodePaths in pose library joint order
+            task_name (str): Name of the per-frame task
+            max_frames (int): Initial keyframe capacity, grown on demand
+            cache (TimelineCache): Compiled timeline cache, a private one by default
+        """
+        self.joints = joints
+        self.cache = cache if cache is not None else TimelineCache()
+        self.task_name = task_name
+        self.done_event = task_name + "-done"
+        self.clock = ClockObject.getGlobalClock()
+
+        # Live joint state and what was last written to the scene graph
+        self.current = np.empty((JOINT_COUNT, FLOATS_PER_JOINT), dtype=np.float32)
+        self.read_joints()
+        self._written = self.current.copy()
+
+        # Preallocated blend buffers, reused for every clip
+        self._keys = np.empty((max_frames + 1, JOINT_COUNT, FLOATS_PER_JOINT), dtype=np.float32)
+        self._times = np.empty(max_frames + 1, dtype=np.float64)  # Time each key is reached
+        self._changed = np.empty((JOINT_COUNT, FLOATS_PER_JOINT), dtype=bool)
+        self._dirty = np.empty(JOINT_COUNT, dtype=bool)
+
+        self._key_count = 0
+        self._start_time = 0.0
+        self.playing = False
+
+        taskMgr.add(self._update, self.task_name)
+
+    def destroy(self):
+        taskMgr.remove(self.task_name)
+        self.playing = False
+
+    def read_joints(self):
+        """Copy the joints' current transforms into the live state"""
+        for i, joint in enumerate(self.joints):
+            pos = joint.getPos()
+            hpr = joint.getHpr()
+            self.current[i] = (pos[0], pos[1], pos[2], hpr[0], hpr[1], hpr[2])
+
+    @property
+    def duration(self):
+        return self._times[self._key_count - 1] if self._key_count else 0.0
+
+    def _reserve(self, frames):
+        if frames + 1 > len(self._keys):
+            self._keys = np.empty((frames + 1, JOINT_COUNT, FLOATS_PER_JOINT), dtype=np.float32)
+            self._times = np.empty(frames + 1, dtype=np.float64)
+
+    def play(self, clip, frame_time=0.2):
+        """
+        Blend from the current pose through every frame of a SignClip.
+
+        Args:
+            clip (SignClip): Clip to play
+            frame_time (float): Seconds spent blending into each keyframe
+        """
+        timeline = self.cache.get((clip.name, clip.version), compile_timeline, clip)
+        count = len(timeline.filled)
+        self._reserve(count)
+        keys = self._keys
+        keys[0] = self.current
+        keys[1:count + 1] = timeline.filled
+        np.copyto(keys[1:count + 1], self.current, where=timeline.unset)
+        np.multiply(np.arange(count + 1), frame_time, out=self._times[:count + 1])
+        self._start(count + 1)
+
+    def play_keys(self, poses, durations=0.2):
+        """
+        Blend from the current pose through fully specified (n, JOINT_COUNT, 6) poses.
+
+        Args:
+            poses (ndarray): Keyframe poses
+            durations (float or ndarray): Seconds spent blending into each keyframe
+        """
+        count = len(poses)
+        self._reserve(count)
+        self._keys[0] = self.current
+        self._keys[1:count + 1] = poses
+        self._times[0] = 0.0
+        self._times[1:count + 1] = durations
+        np.cumsum(self._times[1:count + 1], out=self._times[1:count + 1])
+        self._start(count + 1)
+
+    def _start(self, key_count):
+        self._key_count = key_count
+        self._start_time = self.clock.getFrameTime()
+        self.playing = True
+
+    def stop(self):
+        """Cancel the blend in progress, keeping whatever pose the joints are in now"""
+        self.playing = False
+        self.sync()
+
+    def sync(self):
+        """Re-read the joints after something other than the blender moved them"""
+        self.read_joints()
+        self._written[:] = self.current
+
+    def snap(self, frame):
+        """Jump straight to a PoseFrame, cancelling any blend in progress"""
+        self.playing = False
+        self.sync()
+        np.copyto(self.current, frame.values, where=frame.mask[:, None])
+        self._flush()
+
+    def _flush(self):
+        """Write joints whose live value differs from what the scene graph already has"""
+        np.not_equal(self.current, self._written, out=self._changed)
+        np.any(self._changed, axis=1, out=self._dirty)
+        for i in np.flatnonzero(self._dirty):
+            values = self.current[i]
+            self.joints[i].setPosHpr(*values.tolist())
+            self._written[i] = values
+
+    def _update(self, task):
+        if not self.playing:
+            return Task.cont
+
+        elapsed = self.clock.getFrameTime() - self._start_time
+        last = self._key_count - 1
+        finished = elapsed >= self._times[last]
+        if finished:
+            self.current[:] = self._keys[last]
+            self.playing = False
+        else:
+            # Segment k runs from key k to key k + 1; zero-length segments are skipped over
+            k = int(np.searchsorted(self._times[:last + 1], elapsed, side="right")) - 1
+            alpha = (elapsed - self._times[k]) / (self._times[k + 1] - self._times[k])
+            # current = keys[k] + (keys[k + 1] - keys[k]) * alpha, without temporaries
+            np.subtract(self._keys[k + 1], self._keys[k], out=self.current)
+            self.current *= alpha
+            self.current += self._keys[k]
+
+        self._flush()
+        if finished:
+            messenger.send(self.done_event)
+        return Task.cont
@@ -0,0 +1,327 @@
+"""
+Compiled, memory-mapped pose library.
+
+The JSON pose files (sign_poses.json, sign_poses2.json, sign_posesx.json) are
+compiled into a flat binary file: a sorted name index followed by contiguous
+float32 frames in a fixed joint order. The compiled file is opened with mmap,
+so opening it costs the same for 28 signs or for tens of thousands.
+
+Usage:
+    python pose_library.py compile-lexicon sign_poses.json [-o sign_poses.poselib]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+
+HANDS = ("leftHand", "rightHand")
+FINGERS = (("thumb", 2), ("index", 3), ("middle", 3), ("ring", 3), ("pinky", 3))
+
+# Fixed joint order: the two arm roots, then 14 finger segments per hand
+JOINT_NAMES = ["larm", "rarm"] + [
+    f"{side}{finger}{segment}"
+    for side in ("l", "r")
+    for finger, segments in FINGERS
+    for segment in range(1, segments + 1)
+]
+JOINT_COUNT = len(JOINT_NAMES)
+ARM_JOINTS = 2
+FINGER_JOINTS_PER_HAND = (JOINT_COUNT - ARM_JOINTS) // 2
+FLOATS_PER_JOINT = 6  # x, y, z, h, p, r
+FLOATS_PER_FRAME = JOINT_COUNT * FLOATS_PER_JOINT
+
+MAGIC = b"SPLB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIQII")  # magic, version, floats/frame, entries, frames, digest, names, frames offset
+INDEX_RECORD = struct.Struct("<IHBxII")  # name offset, name length, flags, first frame, frame count
+FLAG_SEQUENCE = 1  # entry was a list of frames rather than a single pose
+COMPILED_SUFFIX = ".poselib"
+
+
+def compiled_path(json_path):
+    """Return the path of the compiled library for a pose JSON file"""
+    return os.path.splitext(json_path)[0] + COMPILED_SUFFIX
+
+
+def _pack_frame(pose, out):
+    """Write one JSON pose into a (JOINT_COUNT, 6) array, leaving missing joints as NaN"""
+    for hand_index, hand in enumerate(HANDS):
+        hand_data = pose.get(hand) or {}
+        out[hand_index, 0:3] = hand_data.get("pos", (np.nan,) * 3)
+        out[hand_index, 3:6] = hand_data.get("hpr", (np.nan,) * 3)
+
+        fingers = hand_data.get("fingers") or {}
+        joint = ARM_JOINTS + hand_index * FINGER_JOINTS_PER_HAND
+        for finger, segments in FINGERS:
+            for segment, segment_data in zip(range(segments), fingers.get(finger, ())):
+                out[joint + segment, 0:3] = segment_data["pos"]
+                out[joint + segment, 3:6] = segment_data["hpr"]
+            joint += segments
+
+
+def compile_lexicon(json_path, out_path=None):
+    """
+    Compile a pose JSON file into a binary pose library.
+
+    Args:
+        json_path (str): Path to the pose JSON file
+        out_path (str): Output path, defaults to the JSON path with a .poselib suffix
+
+    Returns:
+        str: Path of the written library
+    """
+    out_path = out_path or compiled_path(json_path)
+    with open(json_path, "rb") as f:
+        source = f.read()
+    data = json.loads(source)
+
+    entries = sorted((name.encode("utf-8"), poses) for name, poses in data.items())
+    frame_count = sum(len(poses) if isinstance(poses, list) else 1 for _, poses in entries)
+    frames = np.full((frame_count, JOINT_COUNT, FLOATS_PER_JOINT), np.nan, dtype="<f4")
+
+    index = bytearray()
+    names = bytearray()
+    frame = 0
+    for name, poses in entries:
+        is_sequence = isinstance(poses, list)
+        pose_list = poses if is_sequence else [poses]
+        index += INDEX_RECORD.pack(len(names), len(name), FLAG_SEQUENCE if is_sequence else 0,
+                                   frame, len(pose_list))
+        names += name
+        for pose in pose_list:
+            _pack_frame(pose, frames[frame])
+            frame += 1
+
+    names_offset = HEADER.size + len(index)
+    # Align the frame block so it can be viewed as float32 in place
+    frames_offset = (names_offset + len(names) + 15) & ~15
+    digest = int.from_bytes(hashlib.blake2b(source, digest_size=8).digest(), "little")
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, FLOATS_PER_FRAME, len(entries), frame_count,
+                            digest, names_offset, frames_offset))
+        f.write(index)
+        f.write(names)
+        f.write(b"\0" * (frames_offset - names_offset - len(names)))
+        f.write(frames.tobytes())
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class PoseFrame:
+    """
+    One whole-body pose in JOINT_NAMES order.
+
+    values is a (JOINT_COUNT, 6) float32 array with NaN rows for joints the
+    pose leaves alone; mask marks the joints it sets. PoseBlender applies
+    frames with a masked copy into its live state.
+    """
+
+    __slots__ = ("values", "mask")
+
+    def __init__(self, values):
+        self.values = values
+        self.mask = ~np.isnan(values).any(axis=1)
+
+
+class SignClip:
+    """
+    A named pose-library entry: one PoseFrame per keyframe.
+
+    version is the digest of the library the clip came from, so caches keyed
+    by (name, version) go stale when the library is recompiled.
+    """
+
+    __slots__ = ("name", "values", "frames", "is_sequence", "version")
+
+    def __init__(self, name, values, is_sequence, version=0):
+        self.name = name
+        self.values = values
+        self.frames = tuple(PoseFrame(frame) for frame in values)
+        self.is_sequence = is_sequence
+        self.version = version
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class PoseLibrary:
+    """
+    Read-only view of a compiled pose library.
+
+    Lookups binary-search the name index inside the mapped file, so nothing is
+    parsed up front. get() returns the same nested dict/list shape as the JSON
+    file for code that still walks pose dicts.
+    """
+
+    def __init__(self, path):
+        """
+        Open a compiled pose library.
+
+        Args:
+            path (str): Path to a .poselib file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, floats_per_frame, self._entry_count, frame_count,
+         self.digest, self._names_offset, frames_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or floats_per_frame != FLOATS_PER_FRAME:
+            self._map.close()
+            raise ValueError(f"{path} is not a compatible pose library, recompile it")
+
+        self._clips = {}
+        self._frames = np.frombuffer(self._map, dtype="<f4", count=frame_count * FLOATS_PER_FRAME,
+                                     offset=frames_offset).reshape(frame_count, JOINT_COUNT, FLOATS_PER_JOINT)
+
+    def close(self):
+        self._clips = {}
+        self._frames = None
+        self._map.close()
+
+    def _record(self, i):
+        return INDEX_RECORD.unpack_from(self._map, HEADER.size + i * INDEX_RECORD.size)
+
+    def _name(self, i):
+        name_offset, name_len = self._record(i)[:2]
+        start = self._names_offset + name_offset
+        return self._map[start:start + name_len]
+
+    def _find(self, name):
+        """Binary search for a name, returning its index position or -1"""
+        key = name.encode("utf-8")
+        lo, hi = 0, self._entry_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._entry_count and self._name(lo) == key:
+            return lo
+        return -1
+
+    def __len__(self):
+        return self._entry_count
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self._find(name) >= 0
+
+    def __iter__(self):
+        for i in range(self._entry_count):
+            yield self._name(i).decode("utf-8")
+
+    def keys(self):
+        return list(self)
+
+    def frames(self, name):
+        """
+        Return the frames of an entry as a zero-copy (n, JOINT_COUNT, 6) float32 array.
+
+        Missing joints are NaN. Returns None if the entry does not exist.
+        """
+        i = self._find(name)
+        if i < 0:
+            return None
+        _, _, _, first, count = self._record(i)
+        return self._frames[first:first + count]
+
+    def clip(self, name):
+        """
+        Return the entry as a SignClip, or None if it does not exist.
+
+        Clips are normalized once on first use and kept, so repeated signs
+        reuse the same frames.
+        """
+        clip = self._clips.get(name)
+        if clip is None:
+            frames = self.frames(name)
+            if frames is None:
+                return None
+            clip = self._clips[name] = SignClip(name, frames, self.is_sequence(name), self.digest)
+        return clip
+
+    def is_sequence(self, name):
+        i = self._find(name)
+        return i >= 0 and bool(self._record(i)[2] & FLAG_SEQUENCE)
+
+    def get(self, name, default=None):
+        """Decode an entry back into the JSON pose shape (a dict, or a list of dicts)"""
+        frames = self.frames(name)
+        if frames is None:
+            return default
+        poses = [_unpack_frame(frame) for frame in frames]
+        return poses if self.is_sequence(name) else poses[0]
+
+    def __getitem__(self, name):
+        poses = self.get(name)
+        if poses is None:
+            raise KeyError(name)
+        return poses
+
+
+def _joint_dict(values):
+    return {"pos": values[0:3].tolist(), "hpr": values[3:6].tolist()}
+
+
+def _unpack_frame(frame):
+    pose = {}
+    for hand_index, hand in enumerate(HANDS):
+        hand_data = _joint_dict(frame[hand_index])
+        fingers = {}
+        joint = ARM_JOINTS + hand_index * FINGER_JOINTS_PER_HAND
+        for finger, segments in FINGERS:
+            segment_data = [_joint_dict(frame[j]) for j in range(joint, joint + segments)
+                            if not np.isnan(frame[j]).any()]
+            if segment_data:
+                fingers[finger] = segment_data
+            joint += segments
+        if fingers:
+            hand_data["fingers"] = fingers
+        pose[hand] = hand_data
+    return pose
+
+
+def load_pose_library(json_path):
+    """
+    Open the compiled library for a pose JSON file, recompiling it if it is missing or stale.
+
+    Args:
+        json_path (str): Path to the pose JSON file
+
+    Returns:
+        PoseLibrary: The memory-mapped library
+    """
+    path = compiled_path(json_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(json_path):
+        compile_lexicon(json_path, path)
+    return PoseLibrary(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pose library tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser("compile-lexicon", help="Compile pose JSON into a binary pose library")
+    compile_parser.add_argument("json_files", nargs="+", help="Pose JSON files to compile")
+    compile_parser.add_argument("-o", "--output", help="Output path (only with a single input file)")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.json_files) > 1:
+        parser.error("--output can only be used with a single input file")
+
+    for json_path in args.json_files:
+        out_path = compile_lexicon(json_path, args.output)
+        library = PoseLibrary(out_path)
+        print(f"Compiled {len(library)} entries from {json_path} into {out_path}")
+        library.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Event-driven sign scheduling.
+
+Instead of polling on a fixed delay, the next sign starts when the previous
+one sends its completion event, after a configurable hold. Throughput is then
+bounded by the real clip durations.
+"""
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import ClockObject
+
+
+class SignScheduler(DirectObject):
+    """
+    Plays a sequence of poses back to back.
+
+    play_next(sequence, index) starts whatever sign begins at index and
+    returns (poses consumed, completion event name). A None event means
+    nothing was played and the scheduler moves straight on.
+    """
+
+    def __init__(self, play_next, on_complete=None, hold_time=0.3, name="SignScheduler"):
+        """
+        Create an idle scheduler.
+
+        Args:
+            play_next (function): Starts the sign at an index, see class docstring
+            on_complete (function): Called with no arguments when a sequence finishes
+            hold_time (float): Seconds to hold each finished sign before the next starts
+            name (str): Prefix for the scheduler's task names
+        """
+        DirectObject.__init__(self)
+        self.play_next = play_next
+        self.on_complete = on_complete
+        self.hold_time = hold_time
+        self.hold_task = name + "-hold"
+        self.clock = ClockObject.getGlobalClock()
+
+        self.sequence = []
+        self.index = 0
+        self.active = False
+        self.signs_played = 0
+        self.started_at = 0.0
+
+    def start(self, sequence):
+        """Start signing a sequence, abandoning any sequence in progress"""
+        self.stop()
+        self.sequence = list(sequence)
+        self.index = 0
+        self.signs_played = 0
+        self.started_at = self.clock.getFrameTime()
+        self.active = True
+        self._advance()
+
+    def stop(self):
+        """Stop scheduling; the sign currently playing is left to finish"""
+        self.ignoreAll()
+        taskMgr.remove(self.hold_task)
+        self.active = False
+
+    def signs_per_minute(self):
+        elapsed = self.clock.getFrameTime() - self.started_at
+        return self.signs_played * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def _advance(self, task=None):
+        while self.active and self.index < len(self.sequence):
+            count, done_event = self.play_next(self.sequence, self.index)
+            self.index += max(count, 1)
+            if done_event:
+                self.acceptOnce(done_event, self._sign_done)
+                return Task.done
+
+        if self.active:
+            self.active = False
+            if self.on_complete:
+                self.on_complete()
+        return Task.done
+
+    def _sign_done(self, *args):
+        self.signs_played += 1
+        if self.hold_time > 0:
+            taskMgr.doMethodLater(self.hold_time, self._advance, self.hold_task)
+        else:
+            self._advance()
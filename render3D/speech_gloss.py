@@ -0,0 +1,248 @@
+"""
+Continuous speech recognition with gloss translation.
+
+ContinuousSpeechGloss reads audio from the microphone (or a WavFileSource),
+gates it with the VAD, decodes it with a pooled Vosk recognizer and hands
+(transcript, gloss) pairs to a callback. It runs on a background thread, or
+in a worker process through SpeechWorker.
+"""
+import json
+import os
+import queue
+import threading
+
+from audio_capture import CallbackCapture
+from gloss import GlossTranslator
+from gloss_dictionary import load_gloss_dictionary
+from partial_results import PrefixStabilizer
+from pose_library import load_pose_library
+from spelling import SpellCorrector
+from vad import VoiceActivityDetector, SILENCE, START, SPEECH, END
+from vosk_models import preload_model, recognizer_pool, build_grammar
+
+
+class ContinuousSpeechGloss:
+    """
+    Class for continuous speech recognition and gloss translation.
+    Runs in the background and processes speech without auto-stopping.
+    """
+
+    def __init__(self, model_path="C:\\Users\\DELL\\PycharmProjects\\ASR\\vosk-model-small-en-us-0.15", callback=None,
+                 streaming=False, use_vad=True, lexicon_path=None, audio_source=None,
+                 gloss_path="gloss_map.json", correct_below=0.5):
+        """
+        Initialize continuous speech recognition.
+
+        Args:
+            model_path (str): Path to the Vosk model
+            callback (function): Optional callback function that receives (transcript, gloss) tuples
+            streaming (bool): Deliver words as soon as partial results settle instead of
+                waiting for the end of the utterance; each tuple is then the next piece
+                of the utterance rather than all of it
+            use_vad (bool): Skip decoding silence and finalize as soon as speech stops
+            lexicon_path (str): Pose library JSON; if given, only its entries and the
+                gloss map's words are recognized (Vosk grammar mode)
+            audio_source: Source to read instead of the microphone, e.g. a WavFileSource;
+                recognition stops by itself when the source is finished
+            gloss_path (str): English to gloss dictionary, JSON or word<TAB>gloss lines
+            correct_below (float): Words of a final result the recognizer is less sure of
+                than this, and that have no gloss entry, are corrected to a signable word
+                one edit away ("bike" heard as "bake"); 0 turns correction off
+        """
+        # English to gloss dictionary, compiled and memory-mapped
+        self.gloss_map = load_gloss_dictionary(gloss_path)
+        self.translator = GlossTranslator(self.gloss_map)
+        self.correct_below = correct_below
+        self.speller = None  # Built with the lexicon, see _refresh_grammar
+
+        self.model_path = model_path
+        self.callback = callback
+        self.streaming = streaming
+        self.stabilizer = PrefixStabilizer()
+        self.use_vad = use_vad
+        self.vad = None  # VoiceActivityDetector while listening
+        self.lexicon_path = lexicon_path
+        self.recognizer = None
+        self._pool = None
+        self._grammar = None
+        self._lexicon_stamp = None
+        self.audio_source = audio_source
+        self.running = False
+        self.thread = None
+        self.capture = None  # Audio source while listening, see capture_stats()
+        self.results = queue.Queue()  # Store results if no callback is provided
+
+        # Load the model now, in the background, so start() does not wait for it
+        preload_model(self.model_path)
+
+    def convert_to_sign_gloss(self, text):
+        """Convert normal text to sign language gloss notation"""
+        return self.translator.translate(text)
+
+    def start(self):
+        """Start continuous speech recognition"""
+        # A previous listener may still be finishing (stop() only waits a second);
+        # two would share the capture and recognizer
+        if self.running or (self.thread and self.thread.is_alive()):
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self._listen_continuously)
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop continuous speech recognition"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        return True
+
+    def capture_stats(self):
+        """Capture latency and overflow counters, or None if not listening"""
+        return self.capture.stats() if self.capture else None
+
+    def get_latest_result(self):
+        """Get the latest result from the queue (if no callback was provided)"""
+        if not self.results.empty():
+            return self.results.get()
+        return None
+
+    def _deliver(self, text):
+        """Convert text to gloss and pass both to the callback or result queue"""
+        if text:
+            gloss = self.convert_to_sign_gloss(text)
+            if self.callback:
+                self.callback(text, gloss)
+            else:
+                self.results.put((text, gloss))
+
+    def _decode(self, data):
+        """Feed one chunk to the recognizer and deliver whatever it produces"""
+        if self.recognizer.AcceptWaveform(data):
+            self._finish_utterance(json.loads(self.recognizer.Result()))
+        elif self.streaming:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "").replace("[unk]", "")
+            self._deliver(" ".join(self.stabilizer.partial(partial.split())))
+
+    def _finish_utterance(self, result):
+        """Deliver a final result"""
+        # Grammar mode decodes unsignable words as [unk]
+        words = [word for word in result.get("text", "").split() if word != "[unk]"]
+        if self.streaming:
+            # Only what the partials have not already delivered
+            words = self.stabilizer.final(words)
+        self._deliver(" ".join(self._correct(words, result.get("result", ()))))
+
+        # Between utterances is the one safe point to switch recognizers
+        self._refresh_grammar()
+
+    def _correct(self, words, details):
+        """Replace words the recognizer was unsure of with a signable word one edit away"""
+        if not self.speller or not self.correct_below:
+            return words
+        # Vosk only outputs real words, so a confident word is left alone even
+        # if it has no sign: "hate" must not become HAVE
+        unsure = {detail["word"] for detail in details if detail.get("conf", 1.0) < self.correct_below}
+        if not unsure:
+            return words
+        return [self.speller.correct(word) or word if word in unsure and word not in self.gloss_map else word
+                for word in words]
+
+    def _lexicon_words(self):
+        """Pose library entry names, with spaces between words"""
+        library = load_pose_library(self.lexicon_path)
+        try:
+            return [name.replace("_", " ") for name in library if name != "default"]
+        finally:
+            library.close()
+
+    def _refresh_grammar(self):
+        """Borrow a recognizer for the current lexicon, rebuilding the grammar if it changed"""
+        stamp = (os.path.getmtime(self.lexicon_path) if self.lexicon_path else None, len(self.gloss_map))
+        if stamp != self._lexicon_stamp:
+            self._lexicon_stamp = stamp
+            lexicon = self._lexicon_words() if self.lexicon_path else []
+            if self.lexicon_path:
+                self._grammar = build_grammar(lexicon + list(self.gloss_map))
+            # Signed words only: an unsure "they" must not become the unsigned "the"
+            signed = [word for word, gloss in self.gloss_map.items() if gloss and " " not in word]
+            signed.extend(word for name in lexicon for word in name.split())
+            self.speller = SpellCorrector(signed, frozenset(), max_distance=1)
+
+        if self.recognizer is not None:
+            if self._pool.grammar == self._grammar:
+                return
+            self._pool.release(self.recognizer)
+        self._pool = recognizer_pool(self.model_path, self.capture.rate, self._grammar)
+        self.recognizer = self._pool.acquire()
+        # Per-word confidences in final results, for _correct
+        self.recognizer.SetWords(True)
+
+    def _listen_continuously(self):
+        """Background thread that listens for speech continuously"""
+        try:
+            # Wait for the model in short steps so stop() is not held up by a slow load
+            load = preload_model(self.model_path)
+            while not load.done.wait(0.2):
+                if not self.running:
+                    return
+            if load.error is not None:
+                raise load.error
+
+            self.capture = self.audio_source or CallbackCapture(rate=16000, frames_per_buffer=1024)
+
+            # Borrow a recognizer for the cached model (waits only if it is still loading)
+            # before the source starts, so a recording's timing does not include the load
+            self._refresh_grammar()
+            self.stabilizer.reset()
+
+            # Start audio capture; PortAudio fills the ring buffer from its own thread
+            self.capture.start()
+
+            print("Continuous speech recognition started...")
+
+            # Smaller reads let partial results keep up with the speaker
+            chunk = 1600 if self.streaming else 4096
+            if self.use_vad:
+                self.vad = VoiceActivityDetector(rate=self.capture.rate, preroll_chunks=3 if self.streaming else 1)
+
+            while self.running:
+                data = self.capture.read(chunk, timeout=0.5)
+                if data is None:
+                    if self.capture.finished:
+                        break
+                    continue
+
+                state = self.vad.update(data) if self.vad else SPEECH
+                if state == SILENCE:
+                    continue  # Nothing worth decoding
+                if state == START:
+                    # Replay the audio just before speech was detected so onsets are not clipped
+                    for early in self.vad.preroll():
+                        self._decode(early)
+                self._decode(data)
+                if state == END:
+                    # Finalize now rather than waiting for the decoder's own endpointing
+                    self._finish_utterance(json.loads(self.recognizer.FinalResult()))
+
+            if self.capture.finished:
+                # End of a recording: flush whatever the decoder still holds
+                self._finish_utterance(json.loads(self.recognizer.FinalResult()))
+                self.running = False
+
+            # Clean up resources; the model and recognizer stay warm for the next start()
+            self.capture.stop()
+            self._pool.release(self.recognizer)
+            self.recognizer = None
+            print("Continuous speech recognition stopped.")
+
+        except Exception as e:
+            error_msg = f"Error in speech recognition: {str(e)}"
+            print(error_msg)
+            if self.callback:
+                self.callback(error_msg, "")
+            else:
+                self.results.put((error_msg, ""))
+            self.running = False
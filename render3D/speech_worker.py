@@ -0,0 +1,109 @@
+"""
+Speech recognition in a child process.
+
+SpeechWorker runs a speech processor (ContinuousSpeechGloss or anything
+with the same start/stop/callback interface) in its own process, so audio
+capture, decoding and gloss conversion never hold the render process's GIL.
+Results come back as (text, gloss) tuples over a pipe that a Panda3D task
+drains once per frame, which also means the callback runs on the main
+thread.
+"""
+import multiprocessing
+
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+
+
+def _run_processor(conn, processor_class, kwargs):
+    """Child process: build the processor and follow start/stop commands from the parent"""
+    processor = processor_class(callback=lambda text, gloss: conn.send((text, gloss)), **kwargs)
+    while True:
+        try:
+            command = conn.recv()
+        except EOFError:
+            break  # Parent went away
+        if command == "start":
+            processor.start()
+        elif command == "stop":
+            processor.stop()
+        else:
+            break
+    processor.stop()
+
+
+class SpeechWorker:
+    """
+    Drop-in replacement for a speech processor that runs it out of process.
+    """
+
+    def __init__(self, processor_class, callback=None, task_name="SpeechWorkerPoll", **kwargs):
+        """
+        Launch the worker process; the processor loads its model there straight away.
+
+        Args:
+            processor_class (class): Speech processor to run, constructed in the
+                child as processor_class(callback=..., **kwargs)
+            callback (function): Called on the main thread with (text, gloss)
+            task_name (str): Name of the task polling the pipe
+            **kwargs: Passed on to processor_class
+        """
+        self.callback = callback
+        self.task_name = task_name
+        self.running = False
+        self.received = 0
+
+        # Spawn rather than fork so the child does not inherit Panda3D's state
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_run_processor,
+            args=(child_conn, processor_class, kwargs),
+            name="SpeechWorker",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        taskMgr.add(self._poll, self.task_name)
+
+    def start(self):
+        """Start listening in the worker"""
+        if self.running or not self.process.is_alive():
+            return False
+        self._conn.send("start")
+        self.running = True
+        return True
+
+    def stop(self):
+        """Stop listening; the worker and its model stay loaded"""
+        if self.running and self.process.is_alive():
+            self._conn.send("stop")
+        self.running = False
+        return True
+
+    def shutdown(self, timeout=2.0):
+        """Stop the worker process"""
+        taskMgr.remove(self.task_name)
+        if self.process.is_alive():
+            try:
+                self._conn.send("quit")
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        self._conn.close()
+        self.running = False
+
+    def _poll(self, task):
+        # Drain everything that arrived since the last frame
+        try:
+            while self._conn.poll():
+                text, gloss = self._conn.recv()
+                self.received += 1
+                if self.callback:
+                    self.callback(text, gloss)
+        except EOFError:
+            print("Speech worker process exited")
+            self.running = False
+            return Task.done
+        return Task.cont
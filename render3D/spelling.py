@@ -0,0 +1,112 @@
+"""
+Spelling correction against the sign lexicon.
+
+Recognizer near-misses ("helo", "thnak") would otherwise be fingerspelled
+letter by letter. SpellCorrector uses the SymSpell idea: every lexicon word
+is indexed under all strings reachable by deleting up to max_distance
+characters, so candidates for a token are found by generating the token's
+own deletions and looking them up, then confirmed with a real edit distance.
+
+Only tokens that are not real words are corrected: "hate" is one edit from
+"have", and signing HAVE for it is far worse than fingerspelling it. For
+typed text, real words come from a word list, one word per line
+(/usr/share/dict/words, or a Vosk model's graph/words.txt); without one
+nothing is corrected. Speech recognizers only output real words, so
+ContinuousSpeechGloss corrects just the words the recognizer was unsure of.
+"""
+import os
+from functools import lru_cache
+from itertools import combinations
+
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)"""
+    if a == b:
+        return 0
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word, max_distance):
+    """Every string made by deleting up to max_distance characters from word"""
+    result = {word}
+    for count in range(1, min(max_distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), count):
+            result.add("".join(ch for i, ch in enumerate(word) if i not in positions))
+    return result
+
+
+def load_word_list(path):
+    """Return the lower-case words of a one-word-per-line file, or None if it does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        # Vosk's graph/words.txt has a word id after each word
+        return frozenset(line.split()[0].lower() for line in f if line.strip())
+
+
+class SpellCorrector:
+    """
+    Snaps tokens to the closest lexicon word within a small edit distance.
+
+    Short words are left alone (too many real words lie one edit apart),
+    words of 4-7 letters may be one edit off and longer words two. Words in
+    known_words are never corrected.
+    """
+
+    def __init__(self, words, known_words, max_distance=2, min_length=4, cache_size=4096):
+        """
+        Build the deletion index.
+
+        Args:
+            words (iterable): Lexicon words to correct towards
+            known_words (set): Real words, left as they are; see load_word_list
+            max_distance (int): Largest edit distance ever corrected
+            min_length (int): Shortest token that is corrected
+            cache_size (int): Tokens whose correction is remembered
+        """
+        self.words = {word for word in words if len(word) > 1}
+        self.known_words = known_words
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.index = {}
+        for word in self.words:
+            for deleted in _deletes(word, max_distance):
+                self.index.setdefault(deleted, []).append(word)
+        self.correct = lru_cache(maxsize=cache_size)(self._correct)
+
+    def allowed_distance(self, token):
+        if len(token) < self.min_length:
+            return 0
+        return 1 if len(token) < 8 else self.max_distance
+
+    def _correct(self, token):
+        """Return the lexicon word closest to token, or None if none is close enough"""
+        if token in self.words:
+            return token
+        if token in self.known_words:
+            return None  # A real word, just not one the lexicon has
+        limit = self.allowed_distance(token)
+        if not limit:
+            return None
+
+        best = None
+        best_distance = limit + 1
+        for deleted in _deletes(token, limit):
+            for word in self.index.get(deleted, ()):
+                if abs(len(word) - len(token)) > limit:
+                    continue
+                distance = edit_distance(token, word)
+                # Ties go to the alphabetically first word so results are stable
+                if distance < best_distance or (distance == best_distance and word < best):
+                    best, best_distance = word, distance
+        return best
@@ -0,0 +1,38 @@
+from gloss import GlossTranslator
+from morphology import Lemmatizer
+
+GLOSS_MAP = {
+    "the": "", "is": "", "a": "",
+    "i": "ME", "she": "SHE", "not": "NOT", "here": "HERE",
+    "help": "HELP", "store": "STORE", "want": "WANT", "hope": "HOPE", "hop": "HOP",
+    "study": "STUDY", "watch": "WATCH", "go": "GO",
+}
+
+
+def test_function_words_are_not_lemmas():
+    translator = GlossTranslator(GLOSS_MAP)
+    assert translator.translate("the thing is here") == "THING HERE"
+    assert translator.translate("i noted the notes") == "ME NOTED NOTES"
+    assert translator.translate("she shed tears") == "SHE SHED TEARS"
+
+
+def test_inflected_content_words():
+    translator = GlossTranslator(GLOSS_MAP)
+    assert translator.translate("helping stores wanted") == "HELP STORE WANT"
+    assert translator.translate("she studies watches") == "SHE STUDY WATCH"
+    assert translator.translate("hoping hopped went") == "HOPE HOP GO"
+
+
+def test_new_entries_rebuild_the_table():
+    gloss_map = dict(GLOSS_MAP)
+    translator = GlossTranslator(gloss_map)
+    assert translator.translate("noted") == "NOTED"
+    gloss_map["note"] = "NOTE"
+    assert translator.translate("noted") == "NOTE"
+
+
+def test_words_of_their_own_are_not_inflections():
+    lemmatizer = Lemmatizer(["new", "news", "sing"])
+    assert lemmatizer.lemma("news") is None
+    assert lemmatizer.lemma("singing") == "sing"
+    assert lemmatizer.lemma("sings") == "sing"
@@ -0,0 +1,42 @@
+import numpy as np
+
+from vad import VoiceActivityDetector, START, END
+
+RATE = 16000
+CHUNK = 4096
+
+
+def _tone(seconds, amplitude=8000, frequency=220):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def _noise(seconds, amplitude=30, seed=0):
+    return np.random.default_rng(seed).normal(0, amplitude, int(RATE * seconds))
+
+
+def _run(signal):
+    vad = VoiceActivityDetector(rate=RATE)
+    data = signal.astype(np.int16).tobytes()
+    states = [vad.update(data[i:i + CHUNK * 2]) for i in range(0, len(data), CHUNK * 2)]
+    return vad, states
+
+
+def test_recording_that_starts_with_speech():
+    vad, states = _run(np.concatenate([_tone(3), _noise(1), _tone(3)]))
+    assert states[0] == START
+    assert states.count(START) == 2
+    assert END in states
+    assert vad.speech_chunks > len(states) // 2
+
+
+def test_recording_that_starts_with_silence():
+    vad, states = _run(np.concatenate([_noise(1), _tone(3), _noise(1), _tone(3)]))
+    assert states.count(START) == 2
+    assert vad.gated > 0
+
+
+def test_silence_stays_gated():
+    vad, states = _run(_noise(3))
+    assert START not in states
+    assert vad.speech_chunks == 0
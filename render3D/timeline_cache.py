@@ -0,0 +1,74 @@
+"""
+Size-bounded LRU cache for compiled per-sign timelines.
+
+Entries are keyed by (pose name, pose library version), so recompiling the
+library can never serve a timeline built from the old poses.
+"""
+from collections import OrderedDict
+
+
+class TimelineCache:
+    """
+    Least-recently-used cache with a byte budget.
+
+    Values are built on a miss by a caller-supplied function returning
+    (value, nbytes). The most recently used entry is never evicted, even if
+    it alone exceeds the budget.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """
+        Create an empty cache.
+
+        Args:
+            max_bytes (int): Total size budget for cached values
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, build, *args):
+        """
+        Return the cached value for key, building and caching it on a miss.
+
+        Args:
+            key: Cache key, normally (pose name, library version)
+            build (function): Called as build(*args) on a miss, returns (value, nbytes)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value, nbytes = build(*args)
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_bytes
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
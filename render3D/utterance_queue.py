@@ -0,0 +1,152 @@
+"""
+Bounded utterance queue between the speech recognizer and the animator.
+
+The recognizer thread puts utterances; the Panda3D main thread takes them
+when the avatar is free. What happens when the queue is full is set by the
+policy:
+
+    queue        block the producer until there is room (backpressure)
+    coalesce     merge new speech into the newest waiting utterance
+    drop_oldest  discard the oldest waiting utterance
+    preempt      discard everything waiting and ask the consumer to cut
+                 the current sign short
+"""
+import threading
+import time
+from collections import deque
+
+POLICIES = ("queue", "coalesce", "drop_oldest", "preempt")
+
+
+class Utterance:
+    """A recognized (or typed) piece of text waiting to be signed"""
+
+    __slots__ = ("text", "gloss", "enqueued_at")
+
+    def __init__(self, text, gloss=None):
+        self.text = text
+        self.gloss = gloss
+        self.enqueued_at = time.monotonic()
+
+
+class UtteranceQueue:
+    """
+    Thread-safe bounded FIFO of Utterances with a full-queue policy and metrics.
+    """
+
+    def __init__(self, maxsize=8, policy="queue", put_timeout=None):
+        """
+        Create an empty queue.
+
+        Args:
+            maxsize (int): Maximum number of waiting utterances
+            policy (str): One of POLICIES
+            put_timeout (float): Longest a "queue" put blocks before dropping the
+                new utterance, None to wait indefinitely
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown utterance queue policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.put_timeout = put_timeout
+
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._preempt = False
+
+        # Metrics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.preempted = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self._total_lag = 0.0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def put(self, text, gloss=None, merge=False):
+        """
+        Add an utterance, applying the policy if the queue is full.
+
+        Args:
+            text (str): Text to sign
+            gloss (str): Gloss tokens to sign instead, optional
+            merge (bool): Append to the newest waiting utterance if there is one,
+                e.g. for the next streamed piece of the same sentence, so a phrase
+                split across pieces is still signed as one entry
+
+        Returns:
+            bool: False if the utterance was dropped
+        """
+        with self._lock:
+            if self._items and (merge or (len(self._items) >= self.maxsize and self.policy == "coalesce")):
+                last = self._items[-1]
+                last.text = f"{last.text} {text}"
+                if gloss:
+                    last.gloss = f"{last.gloss} {gloss}" if last.gloss else gloss
+                self.coalesced += 1
+                return True
+
+            if len(self._items) >= self.maxsize:
+                if self.policy == "preempt":
+                    self.preempted += len(self._items)
+                    self._items.clear()
+                    self._preempt = True
+                elif self.policy == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                elif not self._not_full.wait_for(lambda: len(self._items) < self.maxsize, self.put_timeout):
+                    self.dropped += 1
+                    return False
+
+            self._items.append(Utterance(text, gloss))
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            return True
+
+    def get_nowait(self):
+        """Return the oldest waiting Utterance, or None if the queue is empty"""
+        with self._lock:
+            if not self._items:
+                return None
+            utterance = self._items.popleft()
+            self._not_full.notify()
+
+        self.dequeued += 1
+        self.last_lag = time.monotonic() - utterance.enqueued_at
+        self._total_lag += self.last_lag
+        return utterance
+
+    def take_preempt(self):
+        """Return True once if a preempting put has arrived since the last call"""
+        with self._lock:
+            preempt, self._preempt = self._preempt, False
+            return preempt
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._preempt = False
+            self._not_full.notify_all()
+
+    def stats(self):
+        with self._lock:
+            depth = len(self._items)
+            oldest_wait = time.monotonic() - self._items[0].enqueued_at if self._items else 0.0
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "preempted": self.preempted,
+            "last_lag": self.last_lag,
+            "mean_lag": self._total_lag / self.dequeued if self.dequeued else 0.0,
+            "oldest_wait": oldest_wait,
+        }
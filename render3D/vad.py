@@ -0,0 +1,147 @@
+"""
+Voice-activity gating for the speech recognizer.
+
+Each captured chunk is split into short frames and classified with NumPy
+from its energy against an adaptive noise floor and its zero-crossing rate.
+The recognizer only decodes chunks around speech, and the end of speech is
+reported so the utterance can be finalized immediately instead of waiting
+for the decoder's own endpointing.
+"""
+from collections import deque
+
+import numpy as np
+
+SILENCE = "silence"
+START = "start"    # First chunk of speech; preroll() holds the audio just before it
+SPEECH = "speech"
+END = "end"        # Speech has stopped for hangover_ms; finalize the utterance
+
+
+class VoiceActivityDetector:
+    """
+    Energy/zero-crossing VAD over 16-bit mono chunks.
+
+    A frame is speech if its level is margin_db above the noise floor and its
+    zero-crossing rate is below zcr_max (hiss crosses zero far more often than
+    voice), or if it is a further margin_db louder regardless. A chunk is
+    speech if it holds at least min_speech_frames speech frames.
+
+    The noise floor starts low and follows the quietest frames of each chunk:
+    it drops to them at once and rises slowly, faster during silence than
+    during speech. A recording that starts mid-sentence therefore cannot set
+    the floor at speech level.
+    """
+
+    def __init__(self, rate=16000, frame_ms=20, margin_db=10.0, min_db=-50.0, zcr_max=0.35,
+                 min_speech_frames=2, hangover_ms=400, preroll_chunks=3, floor_rise=0.05,
+                 floor_rise_speech=0.01):
+        """
+        Create a detector in the silence state.
+
+        Args:
+            rate (int): Sample rate in Hz
+            frame_ms (int): Analysis frame length
+            margin_db (float): Level above the noise floor that counts as speech
+            min_db (float): Quietest level (dBFS) ever treated as speech
+            zcr_max (float): Highest zero-crossing rate (crossings per sample) for voice
+            min_speech_frames (int): Speech frames needed to call a chunk speech
+            hangover_ms (int): Silence after speech before END is reported
+            preroll_chunks (int): Silent chunks kept to replay at the start of speech
+            floor_rise (float): Fraction of the gap to the quiet level the noise floor
+                rises per silent chunk
+            floor_rise_speech (float): The same while in speech, so sustained noise
+                is eventually treated as background
+        """
+        self.rate = rate
+        self.frame_length = rate * frame_ms // 1000
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.zcr_max = zcr_max
+        self.min_speech_frames = min_speech_frames
+        self.hangover = hangover_ms / 1000.0
+        self.floor_rise = floor_rise
+        self.floor_rise_speech = floor_rise_speech
+
+        self.min_floor_db = min_db - margin_db
+        self.noise_db = self.min_floor_db
+        self.in_speech = False
+        self._silence_time = 0.0
+        self._preroll = deque(maxlen=preroll_chunks)
+
+        # Metrics
+        self.chunks = 0
+        self.speech_chunks = 0
+        self.gated = 0  # Silent chunks held back from the decoder
+        self.utterances = 0
+
+    def _levels(self, data):
+        """Return per-frame level in dBFS and zero-crossing rate"""
+        samples = np.frombuffer(data, dtype=np.int16)
+        count = len(samples) // self.frame_length
+        frames = samples[:count * self.frame_length].reshape(count, self.frame_length).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) + 1e-3
+        level = 20.0 * np.log10(rms / 32768.0)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_length
+        return level, zcr
+
+    def _track_floor(self, level, is_speech):
+        """Move the noise floor towards the quietest frames of a chunk"""
+        quiet = max(float(np.percentile(level, 10)), self.min_floor_db)
+        if quiet < self.noise_db:
+            self.noise_db = quiet
+        else:
+            rise = self.floor_rise_speech if is_speech else self.floor_rise
+            self.noise_db += rise * (quiet - self.noise_db)
+
+    def update(self, data):
+        """
+        Classify the next chunk.
+
+        Returns:
+            str: SILENCE, START, SPEECH or END
+        """
+        self.chunks += 1
+        level, zcr = self._levels(data)
+        if not len(level):
+            return SPEECH if self.in_speech else SILENCE
+
+        threshold = max(self.noise_db + self.margin_db, self.min_db)
+        speech_frames = ((level > threshold) & (zcr < self.zcr_max)) | (level > threshold + self.margin_db)
+        is_speech = np.count_nonzero(speech_frames) >= self.min_speech_frames
+        self._track_floor(level, is_speech)
+
+        if is_speech:
+            self.speech_chunks += 1
+            self._silence_time = 0.0
+            if not self.in_speech:
+                self.in_speech = True
+                self.utterances += 1
+                return START
+            return SPEECH
+
+        if self.in_speech:
+            self._silence_time += len(data) / 2.0 / self.rate
+            if self._silence_time >= self.hangover:
+                self.in_speech = False
+                return END
+            return SPEECH
+
+        self._preroll.append(data)
+        self.gated += 1
+        return SILENCE
+
+    def preroll(self):
+        """Take the silent chunks buffered before the current START"""
+        chunks = list(self._preroll)
+        self._preroll.clear()
+        return chunks
+
+    def stats(self):
+        return {
+            "chunks": self.chunks,
+            "speech_chunks": self.speech_chunks,
+            "gated": self.gated,
+            "utterances": self.utterances,
+            "noise_db": self.noise_db,
+        }
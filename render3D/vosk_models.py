@@ -0,0 +1,144 @@
+"""
+Process-wide cache of Vosk models and recognizers.
+
+A Vosk model takes seconds to load, so each model path is loaded once, on a
+background thread, and kept for the life of the process. Recognizers are
+borrowed from a small per-model pool and Reset() on return, which makes
+stopping and restarting recognition nearly free. A pool can be restricted
+to a grammar (a fixed word list) to decode only words that can be signed.
+"""
+import json
+import threading
+
+try:
+    from vosk import Model, KaldiRecognizer
+except ImportError:
+    Model = KaldiRecognizer = None
+
+_lock = threading.Lock()
+_loads = {}  # model path -> _ModelLoad
+_pools = {}  # (model path, sample rate, grammar) -> RecognizerPool
+
+
+class _ModelLoad:
+    """A model load in progress or finished"""
+
+    def __init__(self, path):
+        self.path = path
+        self.model = None
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            if Model is None:
+                raise RuntimeError("Vosk is required for speech recognition")
+            self.model = Model(self.path)
+        except Exception as e:
+            self.error = e
+            # Forget the failure so a later call can retry
+            with _lock:
+                if _loads.get(self.path) is self:
+                    del _loads[self.path]
+        finally:
+            self.done.set()
+
+
+def preload_model(path):
+    """Start loading a model in the background if it is not loaded or loading already"""
+    with _lock:
+        load = _loads.get(path)
+        if load is None:
+            load = _loads[path] = _ModelLoad(path)
+            threading.Thread(target=load.run, name="VoskModelLoad", daemon=True).start()
+    return load
+
+
+def get_model(path, timeout=None):
+    """
+    Return the cached model for a path, waiting for it to finish loading.
+
+    Args:
+        path (str): Path to the Vosk model directory
+        timeout (float): Longest to wait, None to wait indefinitely
+
+    Returns:
+        Model: The loaded model
+    """
+    load = preload_model(path)
+    if not load.done.wait(timeout):
+        raise TimeoutError(f"Vosk model still loading: {path}")
+    if load.error is not None:
+        raise load.error
+    return load.model
+
+
+def is_model_ready(path):
+    with _lock:
+        load = _loads.get(path)
+    return load is not None and load.done.is_set() and load.error is None
+
+
+def build_grammar(words):
+    """
+    Build a Vosk grammar from a word list.
+
+    Anything outside the list is decoded as [unk] instead of the nearest
+    word in the full vocabulary.
+
+    Returns:
+        str: JSON grammar for KaldiRecognizer
+    """
+    return json.dumps(sorted({word.lower() for word in words if word}) + ["[unk]"])
+
+
+class RecognizerPool:
+    """
+    Reusable KaldiRecognizers for one model, sample rate and grammar.
+    """
+
+    def __init__(self, model, rate=16000, grammar=None, size=2):
+        """
+        Create an empty pool.
+
+        Args:
+            model (Model): Loaded Vosk model
+            rate (float): Sample rate of the audio the recognizers will see
+            grammar (str): JSON grammar from build_grammar, None for open vocabulary
+            size (int): Most idle recognizers kept for reuse
+        """
+        self.model = model
+        self.rate = rate
+        self.grammar = grammar
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self.created += 1
+        if self.grammar is None:
+            return KaldiRecognizer(self.model, self.rate)
+        return KaldiRecognizer(self.model, self.rate, self.grammar)
+
+    def release(self, recognizer):
+        """Return a recognizer, discarding any half-decoded utterance"""
+        recognizer.Reset()
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(recognizer)
+
+
+def recognizer_pool(path, rate=16000, grammar=None, timeout=None):
+    """Return the shared RecognizerPool for a model path, loading the model if needed"""
+    model = get_model(path, timeout)
+    with _lock:
+        pool = _pools.get((path, rate, grammar))
+        if pool is None:
+            pool = _pools[(path, rate, grammar)] = RecognizerPool(model, rate, grammar)
+    return pool